@@ -2,8 +2,11 @@
 Network Dynamics Analysis Tool
 Simulates network behavior and identifies attractors, oscillations
 """
-import random
-from typing import Dict, Any, List, Set
+from typing import Dict, Any, List, Optional, Set
+
+import numpy as np
+
+from agent.tools.load_bnd_network import load_network, nodes_by_type
 
 
 def execute_natural_language(context: str, model_path: str) -> str:
@@ -19,20 +22,8 @@ def execute_natural_language(context: str, model_path: str) -> str:
     """
     try:
         # Load and analyze dynamics
-        import sys
-        from pathlib import Path
-
-        # Add parent directory to path
-        parent_dir = Path(__file__).parent.parent.parent.parent
-        sys.path.insert(0, str(parent_dir))
-
-        from gene_network_standalone import StandaloneGeneNetwork
-        from agent.tools.load_bnd_network import convert_bnd_to_standard_format
-
         # Load the network
-        network = StandaloneGeneNetwork()
-        network.load_bnd_file(model_path)
-        model_data = convert_bnd_to_standard_format(network, model_path)
+        network, model_data = load_network(model_path)
 
         # Perform dynamics analysis
         dynamics_results = _analyze_dynamics_internal(model_data, network)
@@ -42,6 +33,7 @@ def execute_natural_language(context: str, model_path: str) -> str:
         has_oscillations = dynamics_results["has_oscillations"]
         unstable_nodes = dynamics_results["unstable_nodes"]
         num_unstable = len(unstable_nodes)
+        total_nodes = len(model_data['nodes'])
 
         # Assess dynamics characteristics
         stability_assessment = "highly stable" if num_unstable == 0 else "moderately stable" if num_unstable < 3 else "unstable"
@@ -54,14 +46,14 @@ def execute_natural_language(context: str, model_path: str) -> str:
 - **Oscillations**: {'Detected' if has_oscillations else 'None detected'} {'(dynamic regulatory cycles)' if has_oscillations else '(steady-state behavior)'}
 
 **Network Stability:**
-- **Unstable Nodes**: {num_unstable} out of {len(model_data['nodes'])} nodes
+- **Unstable Nodes**: {num_unstable} out of {total_nodes} nodes
 - **Stability Assessment**: {stability_assessment.title()}
 - **Sensitive Elements**: {', '.join(unstable_nodes[:5])}{'...' if len(unstable_nodes) > 5 else ''}
 
 **Dynamical Assessment:**
 The network exhibits {'rich dynamical behavior' if num_attractors > 3 else 'moderate dynamical complexity' if num_attractors > 1 else 'simple dynamics'} with {num_attractors} distinct stable state{'s' if num_attractors != 1 else ''}.
 
-{'**High instability detected** - many nodes show sensitive behavior to perturbations.' if num_unstable > len(model_data['nodes']) * 0.5 else '**Good stability** - most regulatory elements show robust behavior.' if num_unstable < 3 else '**Moderate instability** - some regulatory elements are sensitive to perturbations.'}
+{'**High instability detected** - many nodes show sensitive behavior to perturbations.' if num_unstable > total_nodes * 0.5 else '**Good stability** - most regulatory elements show robust behavior.' if num_unstable < 3 else '**Moderate instability** - some regulatory elements are sensitive to perturbations.'}
 
 {'**Oscillatory behavior detected** - suggests active regulatory cycles and temporal dynamics.' if has_oscillations else '**Steady-state behavior** - network tends toward stable equilibrium states.'}
 
@@ -93,10 +85,12 @@ def execute(state: Dict[str, Any]) -> Dict[str, Any]:
     # Simple dynamics simulation
     results = simulate_network_dynamics(model_data, bnd_network)
 
-    print(f"Dynamics analysis complete:")
-    print(f"   Attractors found: {results['num_attractors']}")
-    print(f"   Unstable nodes: {len(results['unstable_nodes'])}")
-    print(f"   Oscillations detected: {results['has_oscillations']}")
+    print("\n".join([
+        "Dynamics analysis complete:",
+        f"   Attractors found: {results['num_attractors']}",
+        f"   Unstable nodes: {len(results['unstable_nodes'])}",
+        f"   Oscillations detected: {results['has_oscillations']}",
+    ]))
 
     return {
         "dynamics_results": results,
@@ -104,66 +98,80 @@ def execute(state: Dict[str, Any]) -> Dict[str, Any]:
     }
 
 
-def simulate_network_dynamics(model_data: Dict[str, Any], bnd_network=None) -> Dict[str, Any]:
+def simulate_network_dynamics(model_data: Dict[str, Any], bnd_network=None,
+                              seed: Optional[int] = None) -> Dict[str, Any]:
     """
     Simple network dynamics simulation
+    Network states are bit-packed into Python ints: logic nodes occupy the low
+    bits so a whole update is one XOR with a flip mask.
+    Initial states and flips come from one generator; pass a seed to reproduce a run.
     """
     nodes = model_data["nodes"]
-    logic_nodes = [name for name, info in nodes.items() if info["type"] == "logic"]
-    input_nodes = [name for name, info in nodes.items() if info["type"] == "input"]
+    logic_nodes = nodes_by_type(model_data)["logic"]
+    logic_set = set(logic_nodes)
+    bit_order = logic_nodes + [name for name in nodes if name not in logic_set]
+    bit_index = {name: bit for bit, name in enumerate(bit_order)}
+    num_nodes = len(bit_order)
+    num_logic = len(logic_nodes)
+    state_bytes = (num_nodes + 7) // 8
+    rng = np.random.default_rng(seed)
     
     attractors = []
     unstable_nodes = set()
     oscillation_detected = False
+    progress = []  # Progress lines, printed once after all simulations
     
     # Run multiple simulations with different initial conditions
     num_simulations = 10
     
     for sim in range(num_simulations):
-        print(f"   Simulation {sim + 1}/{num_simulations}")
+        progress.append(f"   Simulation {sim + 1}/{num_simulations}")
         
         # Random initial state
-        state = {node: random.choice([True, False]) for node in nodes.keys()}
+        state = int.from_bytes(rng.bytes(state_bytes), "little") & ((1 << num_nodes) - 1)
         
         # Simulate for max_steps
         max_steps = 20
         history = []
+        seen = set()
         
         for step in range(max_steps):
-            history.append(state.copy())
+            history.append(state)
+            seen.add(state)
             
-            # Update logic nodes (simple random update for now)
-            new_state = state.copy()
-            
-            for node in logic_nodes:
-                # Simple random dynamics (can be enhanced with real BND simulation)
-                if random.random() < 0.3:  # 30% chance to flip
-                    new_state[node] = not state[node]
+            # Update logic nodes (simple random update for now):
+            # each logic node has a 30% chance to flip
+            flips = np.packbits(rng.random(num_logic) < 0.3, bitorder="little")
+            new_state = state ^ int.from_bytes(flips.tobytes(), "little")
             
             # Check for steady state
             if new_state == state:
-                print(f"     Steady state reached at step {step}")
-                attractors.append(state.copy())
+                progress.append(f"     Steady state reached at step {step}")
+                attractors.append(_unpack_state(state, nodes, bit_index))
                 break
             
             # Check for oscillation (cycle in history)
-            if new_state in history:
+            if new_state in seen:
                 oscillation_detected = True
                 cycle_start = history.index(new_state)
                 cycle_length = step - cycle_start
                 if cycle_length > 1:
-                    print(f"     Oscillation detected (cycle length: {cycle_length})")
+                    progress.append(f"     Oscillation detected (cycle length: {cycle_length})")
                 break
             
             state = new_state
         
         # Identify unstable nodes (nodes that change frequently)
         if len(history) > 5:
-            for node in logic_nodes:
-                changes = sum(1 for i in range(1, len(history)) 
-                            if history[i][node] != history[i-1][node])
-                if changes > len(history) * 0.3:  # Changed more than 30% of the time
-                    unstable_nodes.add(node)
+            diffs = np.frombuffer(b"".join(
+                (history[i] ^ history[i - 1]).to_bytes(state_bytes, "little")
+                for i in range(1, len(history))
+            ), dtype=np.uint8).reshape(len(history) - 1, state_bytes)
+            changes = np.unpackbits(diffs, axis=1, bitorder="little").sum(axis=0)
+            for bit in np.flatnonzero(changes[:num_logic] > len(history) * 0.3):  # Changed more than 30% of the time
+                unstable_nodes.add(logic_nodes[bit])
+    
+    print("\n".join(progress))
     
     return {
         "attractors": attractors,
@@ -174,6 +182,11 @@ def simulate_network_dynamics(model_data: Dict[str, Any], bnd_network=None) -> D
     }
 
 
+def _unpack_state(state: int, nodes: Dict[str, Any], bit_index: Dict[str, int]) -> Dict[str, bool]:
+    """Expand a bit-packed network state into a node -> bool dict"""
+    return {node: bool(state >> bit_index[node] & 1) for node in nodes}
+
+
 # Tool definition for the registry
 TOOL_DEFINITION = {
     "name": "analyze_dynamics", 
@@ -183,5 +196,6 @@ TOOL_DEFINITION = {
     "output_provides": ["dynamics_results", "dynamics_analyzed"],
     "category": "analyzer",
     "priority": 80,
-    "enabled": True
+    "enabled": True,
+    "deterministic": False  # Random initial states and updates; never reuse stored results
 }
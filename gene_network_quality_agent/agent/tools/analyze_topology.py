@@ -5,6 +5,8 @@ Analyzes the structural properties of gene networks
 import networkx as nx
 from typing import Dict, Any, List
 
+from agent.tools.load_bnd_network import load_network
+
 
 def execute_natural_language(context: str, model_path: str) -> str:
     """
@@ -19,20 +21,8 @@ def execute_natural_language(context: str, model_path: str) -> str:
     """
     try:
         # We need to load the network first to analyze topology
-        import sys
-        from pathlib import Path
-
-        # Add parent directory to path
-        parent_dir = Path(__file__).parent.parent.parent.parent
-        sys.path.insert(0, str(parent_dir))
-
-        from gene_network_standalone import StandaloneGeneNetwork
-        from agent.tools.load_bnd_network import convert_bnd_to_standard_format
-
         # Load the network
-        network = StandaloneGeneNetwork()
-        network.load_bnd_file(model_path)
-        model_data = convert_bnd_to_standard_format(network, model_path)
+        network, model_data = load_network(model_path)
 
         # Perform topology analysis
         topology_results = _analyze_topology_internal(model_data)
@@ -82,17 +72,16 @@ def _analyze_topology_internal(model_data: Dict[str, Any]) -> Dict[str, Any]:
     nodes = model_data["nodes"]
 
     # Add nodes
-    for node_name, node_info in nodes.items():
-        G.add_node(node_name, **node_info)
-
-    # Add edges based on logic dependencies
-    for node_name, node_info in nodes.items():
-        if node_info["type"] == "logic":
-            logic = node_info.get("logic", "")
-            # Simple dependency extraction (can be enhanced)
-            dependencies = extract_dependencies(logic, nodes.keys())
-            for dep in dependencies:
-                G.add_edge(dep, node_name)
+    G.add_nodes_from(nodes.items())
+
+    # Add edges based on logic dependencies, streamed straight into the graph
+    # Simple dependency extraction (can be enhanced)
+    G.add_edges_from(
+        (dep, node_name)
+        for node_name, node_info in nodes.items()
+        if node_info["type"] == "logic"
+        for dep in extract_dependencies(node_info.get("logic", ""), nodes.keys())
+    )
 
     # Calculate topology metrics
     num_nodes = G.number_of_nodes()
@@ -158,11 +147,13 @@ def execute(state: Dict[str, Any]) -> Dict[str, Any]:
         "cycle_details": cycles[:10]  # Store first 10 cycles
     }
 
-    print(f"Topology analysis complete:")
-    print(f"   Nodes: {num_nodes}")
-    print(f"   Edges: {num_edges}")
-    print(f"   Cycles: {num_cycles}")
-    print(f"   Strongly connected components: {num_sccs}")
+    print("\n".join([
+        "Topology analysis complete:",
+        f"   Nodes: {num_nodes}",
+        f"   Edges: {num_edges}",
+        f"   Cycles: {num_cycles}",
+        f"   Strongly connected components: {num_sccs}",
+    ]))
     
     return {
         "topology_results": results,
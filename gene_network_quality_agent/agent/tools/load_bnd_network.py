@@ -2,20 +2,71 @@
 BND Network Loader Tool
 Loads and parses .bnd files using gene_network_standalone.py
 """
+import os
 import sys
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, List, Tuple
 
 # Add parent directory to path to import gene_network_standalone
-parent_dir = Path(__file__).parent.parent.parent.parent
-sys.path.insert(0, str(parent_dir))
+parent_dir = str(Path(__file__).parent.parent.parent.parent)
+if parent_dir not in sys.path:
+    sys.path.insert(0, parent_dir)
 
 try:
-    from gene_network_standalone import StandaloneGeneNetwork
+    from gene_network_standalone import BooleanExpression, StandaloneGeneNetwork
 except ImportError:
     print("⚠️  Could not import StandaloneGeneNetwork")
+    BooleanExpression = None
     StandaloneGeneNetwork = None
 
+# Shared node type tags reused across conversions
+INPUT_TYPE = sys.intern("input")
+LOGIC_TYPE = sys.intern("logic")
+
+
+class _LazyNetwork:
+    """
+    Lightweight stand-in for a StandaloneGeneNetwork kept in agent state.
+    The full network is only reloaded from disk when an attribute is accessed.
+    """
+
+    __slots__ = ('path', '_net')
+
+    def __init__(self, path: str):
+        self.path = path
+        self._net = None
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        if self._net is None:
+            self._net = _parse_network(self.path)
+        return getattr(self._net, name)
+
+
+def _parse_network(model_path: str) -> Any:
+    """Parse a BND file into a StandaloneGeneNetwork"""
+    network = StandaloneGeneNetwork()
+    network.load_bnd_file(model_path)
+    return network
+
+
+def load_network(model_path: str) -> Tuple[Any, Dict[str, Any]]:
+    """
+    Load a BND file and convert it to the standard format
+    The model_data is shared across tools until the file's modification time changes
+    and must be treated as read-only; the network is a _LazyNetwork, parsed again
+    only if one of its attributes is used
+    """
+    return _LazyNetwork(model_path), _load_model_data_cached(model_path, os.path.getmtime(model_path))
+
+
+@lru_cache(maxsize=8)
+def _load_model_data_cached(model_path: str, mtime: float) -> Dict[str, Any]:
+    """Parse the BND file for a given (path, mtime) and keep only its model_data"""
+    return convert_bnd_to_standard_format(_parse_network(model_path), model_path)
+
 
 def execute_natural_language(context: str, model_path: str) -> str:
     """
@@ -32,19 +83,16 @@ def execute_natural_language(context: str, model_path: str) -> str:
         if not StandaloneGeneNetwork:
             return "**Network Loading Failed**: StandaloneGeneNetwork not available. Cannot load BND files."
 
-        # Load the BND file
-        network = StandaloneGeneNetwork()
-        nodes_created = network.load_bnd_file(model_path)
-
-        # Convert to standard format for analysis
-        model_data = convert_bnd_to_standard_format(network, model_path)
+        # Load the BND file and convert to standard format for analysis
+        network, model_data = load_network(model_path)
 
         # Determine network name
         network_name = Path(model_path).stem.replace("_", " ").title()
 
         # Count different node types
-        input_nodes = len([n for n in model_data['nodes'].values() if n['type'] == 'input'])
-        logic_nodes = len([n for n in model_data['nodes'].values() if n['type'] == 'logic'])
+        groups = nodes_by_type(model_data)
+        input_nodes = len(groups['input'])
+        logic_nodes = len(groups['logic'])
         total_nodes = len(model_data['nodes'])
 
         # Generate natural language evaluation
@@ -81,27 +129,26 @@ def execute(state: Dict[str, Any]) -> Dict[str, Any]:
     if not StandaloneGeneNetwork:
         raise ImportError("StandaloneGeneNetwork not available")
 
-    # Load the BND file
-    network = StandaloneGeneNetwork()
-    nodes_created = network.load_bnd_file(model_path)
-
-    print(f"Loading gene network from {model_path}")
-    print(f"Created {nodes_created} nodes ({len(network.input_nodes)} input nodes)")
-
-    # Convert to standard format
-    model_data = convert_bnd_to_standard_format(network, model_path)
+    # Load the BND file and convert to standard format
+    network, model_data = load_network(model_path)
+    groups = nodes_by_type(model_data)
+    input_count = len(groups['input'])
 
     # Determine network name from file
     network_name = Path(model_path).stem.replace("_", " ").title()
 
-    print(f"Loaded BND model: {network_name}")
-    print(f"   Total nodes: {len(model_data['nodes'])}")
-    print(f"   Input nodes: {len([n for n in model_data['nodes'].values() if n['type'] == 'input'])}")
-    print(f"   Logic nodes: {len([n for n in model_data['nodes'].values() if n['type'] == 'logic'])}")
+    print("\n".join([
+        f"Loading gene network from {model_path}",
+        f"Created {len(model_data['nodes'])} nodes ({input_count} input nodes)",
+        f"Loaded BND model: {network_name}",
+        f"   Total nodes: {len(model_data['nodes'])}",
+        f"   Input nodes: {input_count}",
+        f"   Logic nodes: {len(groups['logic'])}",
+    ]))
     
     return {
         "model_data": model_data,
-        "bnd_network": network,  # Store for dynamics simulation
+        "bnd_network": network,  # Reloaded on demand for dynamics simulation
         "network_name": network_name,
         "network_loaded": True
     }
@@ -111,35 +158,57 @@ def convert_bnd_to_standard_format(network: Any, model_path: str) -> Dict[str, A
     """Convert BND network to standard analysis format"""
     
     nodes = {}
+    by_type = {"input": [], "logic": []}
     
     # Add input nodes
     for input_node in network.input_nodes:
-        nodes[input_node] = {
-            "type": "input",
-            "description": f"Input node {input_node}"
+        key = sys.intern(input_node)
+        nodes[key] = {
+            "type": INPUT_TYPE,
+            "description": f"Input node {key}"
         }
+        by_type["input"].append(key)
     
     # Add logic nodes
     for node_name, node_obj in network.nodes.items():
         if node_name not in network.input_nodes:
             # Extract logic from the node object
             logic_str = "unknown"
-            if hasattr(node_obj, 'logic') and node_obj.logic:
-                logic_str = str(node_obj.logic)
+            if getattr(node_obj, 'logic_rule', ""):
+                logic_str = str(node_obj.logic_rule)
             
-            nodes[node_name] = {
-                "type": "logic",
+            key = sys.intern(node_name)
+            nodes[key] = {
+                "type": LOGIC_TYPE,
                 "logic": logic_str,
-                "description": f"Logic node {node_name}"
+                # Node names referenced by the logic, parsed once at load time
+                "inputs": sorted(sys.intern(name) for name in getattr(node_obj, 'inputs', ())),
+                "description": f"Logic node {key}"
             }
+            by_type["logic"].append(key)
     
     return {
         "name": Path(model_path).stem.replace("_", " ").title(),
         "description": f"Gene network loaded from {model_path}",
-        "nodes": nodes
+        "nodes": nodes,
+        "by_type": by_type
     }
 
 
+def nodes_by_type(model_data: Dict[str, Any]) -> Dict[str, List[str]]:
+    """
+    Node names grouped as "input" and "logic"
+    Uses the grouping precomputed by convert_bnd_to_standard_format when present
+    """
+    by_type = model_data.get("by_type")
+    if by_type is None:
+        by_type = {"input": [], "logic": []}
+        for name, info in model_data["nodes"].items():
+            if info["type"] in by_type:
+                by_type[info["type"]].append(name)
+    return by_type
+
+
 # Tool definition for the registry
 TOOL_DEFINITION = {
     "name": "load_bnd_network",
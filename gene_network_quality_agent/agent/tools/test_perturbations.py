@@ -2,7 +2,54 @@
 Perturbation Testing Tool
 Tests network robustness through knockout and overexpression experiments
 """
-from typing import Dict, Any, List
+import bisect
+import itertools
+import logging
+import re
+from collections import Counter
+from functools import lru_cache
+from typing import Dict, Any, FrozenSet, List
+
+import numpy as np
+
+from agent.tools.load_bnd_network import BooleanExpression, load_network, nodes_by_type
+
+logger = logging.getLogger(__name__)
+
+# Identifier tokens in a logic expression (node names)
+_IDENTIFIER_PATTERN = re.compile(r"[A-Za-z_]\w*")
+
+# Truth tables are enumerated only up to this many inputs per node;
+# larger rules treat every referenced input as influential
+_MAX_TRUTH_TABLE_INPUTS = 16
+
+# A node is robust when its knockout + overexpression impact is below _ROBUST_IMPACT
+# and sensitive when it is above _SENSITIVE_IMPACT
+_ROBUST_IMPACT = 0.2
+_SENSITIVE_IMPACT = 0.8
+
+# Robustness bands by percentage of robust nodes: strictly above a threshold moves up one level
+_ROBUSTNESS_THRESHOLDS = [40, 70]
+_ROBUSTNESS_LEVELS = [
+    {
+        "assessment": "fragile",
+        "summary": "limited robustness",
+        "detail": "Many elements are sensitive to perturbations, suggesting potential fragility.",
+        "verdict": "**Low robustness** - network may be vulnerable to genetic perturbations.",
+    },
+    {
+        "assessment": "moderately robust",
+        "summary": "good robustness",
+        "detail": "A moderate number of elements show robust behavior.",
+        "verdict": "**Moderate robustness** - some sensitivity to perturbations detected.",
+    },
+    {
+        "assessment": "highly robust",
+        "summary": "excellent robustness",
+        "detail": "Most regulatory elements maintain network stability when perturbed.",
+        "verdict": "**High robustness** - network maintains function despite individual gene perturbations.",
+    },
+]
 
 
 def execute_natural_language(context: str, model_path: str) -> str:
@@ -18,50 +65,49 @@ def execute_natural_language(context: str, model_path: str) -> str:
     """
     try:
         # Load and test perturbations
-        import sys
-        from pathlib import Path
-
-        # Add parent directory to path
-        parent_dir = Path(__file__).parent.parent.parent.parent
-        sys.path.insert(0, str(parent_dir))
-
-        from gene_network_standalone import StandaloneGeneNetwork
-        from agent.tools.load_bnd_network import convert_bnd_to_standard_format
-
         # Load the network
-        network = StandaloneGeneNetwork()
-        network.load_bnd_file(model_path)
-        model_data = convert_bnd_to_standard_format(network, model_path)
+        network, model_data = load_network(model_path)
 
         # Perform perturbation testing
         perturbation_results = _test_perturbations_internal(model_data, network)
 
         # Generate natural language evaluation
-        knockout_tests = perturbation_results["knockout_tests"]
-        overexpression_tests = perturbation_results["overexpression_tests"]
+        tested = perturbation_results["knockout_count"]
         robust_nodes = perturbation_results["robust_nodes"]
-        sensitive_nodes = [node for node in model_data["nodes"].keys() if node not in robust_nodes]
-
-        robustness_percentage = (len(robust_nodes) / len(model_data["nodes"])) * 100
-        robustness_assessment = "highly robust" if robustness_percentage > 70 else "moderately robust" if robustness_percentage > 40 else "fragile"
-
-        evaluation = f"""**Perturbation Testing Results**
-
-**Robustness Analysis:**
-- **Knockout Tests**: {knockout_tests} nodes tested
-- **Overexpression Tests**: {overexpression_tests} nodes tested
-- **Robust Nodes**: {len(robust_nodes)} out of {len(model_data['nodes'])} ({robustness_percentage:.1f}%)
-- **Network Assessment**: {robustness_assessment.title()}
-
-**Robust Elements**: {', '.join(robust_nodes[:5])}{'...' if len(robust_nodes) > 5 else ''}
-**Sensitive Elements**: {', '.join(sensitive_nodes[:5])}{'...' if len(sensitive_nodes) > 5 else ''}
-
-**Perturbation Assessment:**
-The network shows {'excellent robustness' if robustness_percentage > 70 else 'good robustness' if robustness_percentage > 40 else 'limited robustness'} to genetic perturbations. {'Most regulatory elements maintain network stability when perturbed.' if robustness_percentage > 70 else 'A moderate number of elements show robust behavior.' if robustness_percentage > 40 else 'Many elements are sensitive to perturbations, suggesting potential fragility.'}
-
-{'**High robustness** - network maintains function despite individual gene perturbations.' if robustness_percentage > 70 else '**Moderate robustness** - some sensitivity to perturbations detected.' if robustness_percentage > 40 else '**Low robustness** - network may be vulnerable to genetic perturbations.'}
-
-**Therapeutic Implications**: {'Robust nodes may be challenging therapeutic targets, while sensitive nodes could be promising intervention points.' if len(sensitive_nodes) > 0 else 'High overall robustness suggests the network has evolved strong fault tolerance.'}"""
+        robust_set = set(robust_nodes)
+        sensitive_nodes = [node for node in model_data["nodes"].keys() if node not in robust_set]
+        total_nodes = len(model_data["nodes"])
+
+        num_robust = len(robust_nodes)
+        robustness_percentage = (num_robust / (total_nodes or 1)) * 100
+        level = _ROBUSTNESS_LEVELS[bisect.bisect_left(_ROBUSTNESS_THRESHOLDS, robustness_percentage)]
+
+        robust_preview = ', '.join(robust_nodes[:5]) + ('...' if len(robust_nodes) > 5 else '')
+        sensitive_preview = ', '.join(sensitive_nodes[:5]) + ('...' if len(sensitive_nodes) > 5 else '')
+        if sensitive_nodes:
+            implications = "Robust nodes may be challenging therapeutic targets, while sensitive nodes could be promising intervention points."
+        else:
+            implications = "High overall robustness suggests the network has evolved strong fault tolerance."
+
+        lines = [
+            "**Perturbation Testing Results**",
+            "",
+            "**Robustness Analysis:**",
+            f"- **Nodes Tested**: {tested} (knockout and overexpression have the same impact per node)",
+            f"- **Robust Nodes**: {num_robust} out of {total_nodes} ({robustness_percentage:.1f}%)",
+            f"- **Network Assessment**: {level['assessment'].title()}",
+            "",
+            f"**Robust Elements**: {robust_preview}",
+            f"**Sensitive Elements**: {sensitive_preview}",
+            "",
+            "**Perturbation Assessment:**",
+            f"The network shows {level['summary']} to genetic perturbations. {level['detail']}",
+            "",
+            level['verdict'],
+            "",
+            f"**Therapeutic Implications**: {implications}",
+        ]
+        evaluation = "\n".join(lines)
 
         return evaluation
 
@@ -86,10 +132,11 @@ def execute(state: Dict[str, Any]) -> Dict[str, Any]:
 
     results = test_network_perturbations(model_data)
 
-    print(f"Perturbation analysis complete:")
-    print(f"   Knockout tests: {results['knockout_count']}")
-    print(f"   Overexpression tests: {results['overexpression_count']}")
-    print(f"   Robust nodes: {len(results['robust_nodes'])}")
+    print("\n".join([
+        "Perturbation analysis complete:",
+        f"   Nodes tested: {results['knockout_count']}",
+        f"   Robust nodes: {len(results['robust_nodes'])}",
+    ]))
 
     return {
         "perturbation_results": results,
@@ -100,33 +147,33 @@ def execute(state: Dict[str, Any]) -> Dict[str, Any]:
 def test_network_perturbations(model_data: Dict[str, Any]) -> Dict[str, Any]:
     """
     Simple perturbation testing
+    A node's impact is the fraction of logic nodes whose rule output can change
+    when the node is forced off (knockout) or on (overexpression). Both change the
+    same truth-table rows, so knockout_results and overexpression_results hold the
+    same impact for every node
     """
-    nodes = model_data["nodes"]
-    logic_nodes = [name for name, info in nodes.items() if info["type"] == "logic"]
+    logic_nodes = nodes_by_type(model_data)["logic"]
     
-    knockout_results = {}
-    overexpression_results = {}
-    robust_nodes = []
-    sensitive_nodes = []
+    total_logic_nodes = len(logic_nodes)
+    divisor = total_logic_nodes or 1
+    dependent_counts = count_dependents(model_data)
     
-    # Test each logic node
-    for node in logic_nodes:
-        print(f"   Testing perturbations for {node}")
-        
-        # Knockout test (force node to False)
-        knockout_impact = simulate_perturbation(node, "knockout", model_data)
-        knockout_results[node] = knockout_impact
-        
-        # Overexpression test (force node to True)  
-        overexpression_impact = simulate_perturbation(node, "overexpression", model_data)
-        overexpression_results[node] = overexpression_impact
-        
-        # Classify node based on perturbation sensitivity
-        total_impact = knockout_impact + overexpression_impact
-        if total_impact < 0.2:  # Low impact
-            robust_nodes.append(node)
-        elif total_impact > 0.8:  # High impact
-            sensitive_nodes.append(node)
+    if logger.isEnabledFor(logging.DEBUG):
+        for node in logic_nodes:
+            logger.debug("Testing perturbations for %s", node)
+    
+    dependents = np.fromiter((dependent_counts.get(node, 0) for node in logic_nodes),
+                             dtype=np.float64, count=total_logic_nodes)
+    impacts = np.minimum(1.0, dependents / divisor)
+    
+    # Classify node based on perturbation sensitivity
+    total_impact = 2 * impacts  # knockout + overexpression
+    node_array = np.asarray(logic_nodes, dtype=object)
+    robust_nodes = node_array[total_impact < _ROBUST_IMPACT].tolist()  # Low impact
+    sensitive_nodes = node_array[total_impact > _SENSITIVE_IMPACT].tolist()  # High impact
+    
+    knockout_results = dict(zip(logic_nodes, impacts.tolist()))
+    overexpression_results = dict(knockout_results)
     
     return {
         "knockout_results": knockout_results,
@@ -138,37 +185,62 @@ def test_network_perturbations(model_data: Dict[str, Any]) -> Dict[str, Any]:
     }
 
 
-def simulate_perturbation(target_node: str, perturbation_type: str, model_data: Dict[str, Any]) -> float:
+def count_dependents(model_data: Dict[str, Any]) -> Counter:
     """
-    Simulate the impact of a perturbation on the network
-    Returns impact score (0.0 = no impact, 1.0 = maximum impact)
+    Count, for every node name, how many logic nodes are sensitive to it
+    A logic node is sensitive to an input when flipping that input changes
+    the rule's output for at least one assignment of the other inputs
     """
-    # Simple impact simulation (can be enhanced with real network simulation)
-    
-    nodes = model_data["nodes"]
-    
-    # Count how many nodes depend on the target node
-    dependent_count = 0
-    for node_name, node_info in nodes.items():
+    dependent_counts = Counter()
+    for node_info in model_data["nodes"].values():
         if node_info["type"] == "logic":
             logic = node_info.get("logic", "")
-            if target_node in logic:
-                dependent_count += 1
-    
-    # Simple impact calculation based on connectivity
-    total_logic_nodes = len([n for n in nodes.values() if n["type"] == "logic"])
-    if total_logic_nodes == 0:
-        return 0.0
-    
-    # Impact is proportional to how many nodes depend on this node
-    base_impact = dependent_count / total_logic_nodes
+            if BooleanExpression is None or logic == "unknown":
+                inputs = node_info.get("inputs")
+                if inputs is None:
+                    inputs = _IDENTIFIER_PATTERN.findall(logic)
+                dependent_counts.update(set(inputs))
+            else:
+                dependent_counts.update(sensitive_inputs(logic))
+    return dependent_counts
+
+
+@lru_cache(maxsize=4096)
+def sensitive_inputs(logic: str) -> FrozenSet[str]:
+    """
+    Return the names in a logic rule whose value can change the rule's output
+    The rule's truth table is packed into an int (bit r holds the output for
+    input assignment r) and each input is tested with two masked compares
+    """
+    expression = BooleanExpression(logic)
+    names = expression.gene_names
+    num_inputs = len(names)
+    if num_inputs > _MAX_TRUTH_TABLE_INPUTS:
+        return frozenset(names)
+    if expression.expression and not expression.is_compiled:
+        # Evaluating would fail on every row; count every referenced input instead
+        logger.warning("Logic rule %r could not be compiled; treating all its inputs as influential", logic)
+        return frozenset(names)
     
-    # Add some randomness to simulate complex dynamics
-    import random
-    random_factor = random.uniform(0.8, 1.2)
+    num_rows = 1 << num_inputs
+    table = 0
+    # product() varies its last element fastest, so reversing the names puts input
+    # `bit` on bit `bit` of the row index
+    reversed_names = names[::-1]
+    for row, values in enumerate(itertools.product((False, True), repeat=num_inputs)):
+        if expression.evaluate(dict(zip(reversed_names, values))):
+            table |= 1 << row
     
-    impact = min(1.0, base_impact * random_factor)
-    return impact
+    all_rows = (1 << num_rows) - 1
+    sensitive = set()
+    for bit, name in enumerate(names):
+        shift = 1 << bit
+        # Rows where this input is off: runs of `shift` rows every 2 * shift rows
+        off_rows = ((1 << shift) - 1) * (all_rows // ((1 << (2 * shift)) - 1))
+        on_rows = off_rows << shift
+        if (table & off_rows) << shift != table & on_rows:
+            sensitive.add(name)
+    return frozenset(sensitive)
 
 
 # Tool definition for the registry
@@ -2,8 +2,60 @@
 Biological Validation Tool
 Validates network biological plausibility and pathway correctness
 """
+import bisect
+import copy
+import hashlib
+import re
+from collections import OrderedDict
 from typing import Dict, Any, List
 
+from agent.tools.load_bnd_network import load_network, nodes_by_type
+
+# Recent validation results keyed by a digest of their inputs (FIFO eviction)
+_VALIDATION_CACHE: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+_VALIDATION_CACHE_SIZE = 32
+
+# Node-name keywords used by the pathway and cell fate checks
+_PATHWAY_KEYWORDS = ("DNA_damage", "Apoptosis", "Proliferation")
+_PATHWAY_KEYWORD_PATTERN = re.compile("|".join(map(re.escape, _PATHWAY_KEYWORDS)))
+# Whole node names (one per line) that contain any pathway keyword
+_PATHWAY_NAME_PATTERN = re.compile(
+    r"^[^\n]*(?:" + "|".join(map(re.escape, _PATHWAY_KEYWORDS)) + r")[^\n]*$", re.MULTILINE
+)
+
+# Plausibility bands: a score strictly above a threshold moves up one level
+_PLAUSIBILITY_THRESHOLDS = [0.4, 0.6, 0.8]
+_PLAUSIBILITY_LEVELS = [
+    {
+        "assessment": "poor",
+        "status": "Significant biological issues",
+        "summary": "significant biological issues",
+        "fidelity": "**Significant biological issues** - substantial revision needed for biological realism.",
+        "implications": "Significant biological validation needed before research application.",
+    },
+    {
+        "assessment": "moderate",
+        "status": "Some biological concerns",
+        "summary": "moderate biological concerns",
+        "fidelity": "**Some biological concerns** - certain aspects may need refinement for biological accuracy.",
+        "implications": "The network may require biological refinement before experimental application.",
+    },
+    {
+        "assessment": "good",
+        "status": "Biologically plausible",
+        "summary": "reasonable biological plausibility",
+        "fidelity": "**Good biological basis** - most regulatory relationships are biologically supported.",
+        "implications": "The network is suitable for biological hypothesis generation and experimental design.",
+    },
+    {
+        "assessment": "excellent",
+        "status": "Biologically plausible",
+        "summary": "strong biological realism",
+        "fidelity": "**High biological fidelity** - the network accurately represents known biological mechanisms.",
+        "implications": "The network is suitable for biological hypothesis generation and experimental design.",
+    },
+]
+
 
 def execute_natural_language(context: str, model_path: str) -> str:
     """
@@ -18,37 +70,38 @@ def execute_natural_language(context: str, model_path: str) -> str:
     """
     try:
         # Load and validate biology
-        import sys
-        from pathlib import Path
-
-        # Add parent directory to path
-        parent_dir = Path(__file__).parent.parent.parent.parent
-        sys.path.insert(0, str(parent_dir))
-
-        from gene_network_standalone import StandaloneGeneNetwork
-        from agent.tools.load_bnd_network import convert_bnd_to_standard_format
-
         # Load the network
-        network = StandaloneGeneNetwork()
-        network.load_bnd_file(model_path)
-        model_data = convert_bnd_to_standard_format(network, model_path)
+        network, model_data = load_network(model_path)
 
         # Perform biological validation
         validation_results = _validate_biology_internal(model_data)
 
         # Generate natural language evaluation
-        plausibility = validation_results["plausibility"]
-        issues = validation_results["issues"]
-        recommendations = validation_results["recommendations"]
+        evaluation = format_validation_markdown(validation_results)
+
+        return evaluation
+
+    except Exception as e:
+        return f"**Biological Validation Failed**: {str(e)}"
+
 
-        plausibility_assessment = "excellent" if plausibility > 0.8 else "good" if plausibility > 0.6 else "moderate" if plausibility > 0.4 else "poor"
+def format_validation_markdown(validation_results: Dict[str, Any]) -> str:
+    """
+    Render structured validation results as the markdown evaluation
+    Only needed where a human-readable report is produced; tools chaining
+    on the results can use the structured dict directly
+    """
+    plausibility = validation_results["biological_plausibility"]
+    issues = validation_results["issues"]
+    recommendations = validation_results["recommendations"]
+    level = _PLAUSIBILITY_LEVELS[bisect.bisect_left(_PLAUSIBILITY_THRESHOLDS, plausibility)]
 
-        evaluation = f"""**Biological Validation Results**
+    return f"""**Biological Validation Results**
 
 **Plausibility Assessment:**
-- **Biological Score**: {plausibility:.3f} ({plausibility_assessment} biological realism)
+- **Biological Score**: {plausibility:.3f} ({level['assessment']} biological realism)
 - **Issues Identified**: {len(issues)} potential concerns
-- **Validation Status**: {'Biologically plausible' if plausibility > 0.6 else 'Some biological concerns' if plausibility > 0.4 else 'Significant biological issues'}
+- **Validation Status**: {level['status']}
 
 **Key Findings:**
 {chr(10).join([f"• {issue}" for issue in issues[:3]])}{'...' if len(issues) > 3 else ''}
@@ -57,16 +110,11 @@ def execute_natural_language(context: str, model_path: str) -> str:
 {chr(10).join([f"• {rec}" for rec in recommendations[:3]])}{'...' if len(recommendations) > 3 else ''}
 
 **Biological Assessment:**
-The network shows {'strong biological realism' if plausibility > 0.8 else 'reasonable biological plausibility' if plausibility > 0.6 else 'moderate biological concerns' if plausibility > 0.4 else 'significant biological issues'} based on known regulatory relationships and pathway logic.
-
-{'**High biological fidelity** - the network accurately represents known biological mechanisms.' if plausibility > 0.8 else '**Good biological basis** - most regulatory relationships are biologically supported.' if plausibility > 0.6 else '**Some biological concerns** - certain aspects may need refinement for biological accuracy.' if plausibility > 0.4 else '**Significant biological issues** - substantial revision needed for biological realism.'}
+The network shows {level['summary']} based on known regulatory relationships and pathway logic.
 
-**Research Implications**: {'The network is suitable for biological hypothesis generation and experimental design.' if plausibility > 0.6 else 'The network may require biological refinement before experimental application.' if plausibility > 0.4 else 'Significant biological validation needed before research application.'}"""
-
-        return evaluation
+{level['fidelity']}
 
-    except Exception as e:
-        return f"**Biological Validation Failed**: {str(e)}"
+**Research Implications**: {level['implications']}"""
 
 
 def _validate_biology_internal(model_data: Dict[str, Any]) -> Dict[str, Any]:
@@ -89,10 +137,12 @@ def execute(state: Dict[str, Any]) -> Dict[str, Any]:
 
     results = validate_biological_plausibility(model_data, topology_results, dynamics_results)
 
-    print(f"Validation complete:")
-    print(f"   Biological plausibility: {results['biological_plausibility']:.2f}")
-    print(f"   Issues found: {len(results['issues'])}")
-    print(f"   Recommendations: {len(results['recommendations'])}")
+    print("\n".join([
+        "Validation complete:",
+        f"   Biological plausibility: {results['biological_plausibility']:.2f}",
+        f"   Issues found: {len(results['issues'])}",
+        f"   Recommendations: {len(results['recommendations'])}",
+    ]))
 
     return {
         "validation_results": results,
@@ -105,95 +155,74 @@ def validate_biological_plausibility(model_data: Dict[str, Any],
                                    dynamics_results: Dict[str, Any] = None) -> Dict[str, Any]:
     """
     Simple rule-based biological validation (placeholder for LLM integration)
+    Results are reused when the same network and analysis results are validated again
     """
+    if not model_data["nodes"]:
+        return {
+            "biological_plausibility": 0.0,
+            "assessment": "poor",
+            "issues": ["Empty network"],
+            "recommendations": ["Provide a non-empty model"],
+            "validation_details": {
+                "biological_score": 0.0,
+                "max_score": 0.0,
+                "input_nodes_count": 0,
+                "total_nodes_count": 0
+            }
+        }
+
+    key = _validation_cache_key(model_data, topology_results, dynamics_results)
+    cached = _VALIDATION_CACHE.get(key)
+    # Callers get their own copy, so changes to a result never reach the cache
+    if cached is not None:
+        return copy.deepcopy(cached)
+
+    results = _score_biological_plausibility(model_data, topology_results, dynamics_results)
+
+    _VALIDATION_CACHE[key] = copy.deepcopy(results)
+    if len(_VALIDATION_CACHE) > _VALIDATION_CACHE_SIZE:
+        _VALIDATION_CACHE.popitem(last=False)
+    return results
+
+
+def _validation_cache_key(model_data: Dict[str, Any],
+                          topology_results: Dict[str, Any] = None,
+                          dynamics_results: Dict[str, Any] = None) -> str:
+    """Digest of everything the validation rules read"""
+    node_types = sorted((name, info["type"]) for name, info in model_data["nodes"].items())
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(repr(node_types).encode())
+    digest.update(repr(topology_results).encode())
+    digest.update(repr(dynamics_results).encode())
+    return digest.hexdigest()
+
+
+def _score_biological_plausibility(model_data: Dict[str, Any],
+                                   topology_results: Dict[str, Any] = None,
+                                   dynamics_results: Dict[str, Any] = None) -> Dict[str, Any]:
+    """Apply the biological validation rules"""
     nodes = model_data["nodes"]
     issues = []
     recommendations = []
     
-    # Check for known biological patterns
+    # Index node names by pathway keyword in a single pass
+    keyword_hits = _index_pathway_keywords(nodes)
+    available = {
+        "topology_results": topology_results,
+        "dynamics_results": dynamics_results,
+    }
+    
+    # Evaluate every applicable rule; only those contribute their weight to max_score
     biological_score = 0.0
     max_score = 0.0
-    
-    # Check for p53 pathway
-    max_score += 1.0
-    if "p53" in nodes:
-        biological_score += 0.5
-        if any("DNA_damage" in name for name in nodes):
-            biological_score += 0.3
-        if any("Apoptosis" in name for name in nodes):
-            biological_score += 0.2
-    else:
-        issues.append("Missing p53 tumor suppressor pathway")
-        recommendations.append("Consider adding p53-mediated DNA damage response")
-    
-    # Check for cell fate decisions
-    max_score += 1.0
-    apoptosis_nodes = [name for name in nodes if "Apoptosis" in name]
-    proliferation_nodes = [name for name in nodes if "Proliferation" in name]
-    
-    if apoptosis_nodes and proliferation_nodes:
-        biological_score += 0.5
-        # Check if they are mutually exclusive (simple check)
-        # This is a placeholder - real validation would check logic
-        biological_score += 0.3
-    else:
-        issues.append("Apoptosis and proliferation may not be mutually exclusive")
-        recommendations.append("Ensure proper cell fate decision logic")
-    
-    # Check dynamics results if available
-    if dynamics_results:
-        max_score += 1.0
-        unstable_count = len(dynamics_results.get("unstable_nodes", []))
-        total_nodes = len(nodes)
-        
-        if total_nodes > 0:
-            stability_ratio = 1.0 - (unstable_count / total_nodes)
-            biological_score += stability_ratio * 0.5
-            
-            if unstable_count > total_nodes * 0.5:
-                issues.append("Many unstable nodes detected")
-                recommendations.append("Review network logic for stability")
-    
-    # Check topology results if available
-    if topology_results:
-        max_score += 1.0
-        cycles = topology_results.get("cycles", 0)
-        
-        if cycles == 0:
-            biological_score += 0.3
-        elif cycles < 3:
-            biological_score += 0.2
-        else:
-            issues.append("Many feedback loops may cause instability")
-            recommendations.append("Review feedback loop necessity")
-        
-        # Check connectivity
-        if topology_results.get("connected", False):
-            biological_score += 0.2
-        else:
-            issues.append("Network has disconnected components")
-            recommendations.append("Ensure all pathways are properly connected")
-    
-    # Additional simple checks
-    max_score += 1.0
-    
-    # Check for input nodes
-    input_nodes = [name for name, info in nodes.items() if info["type"] == "input"]
-    if len(input_nodes) > 0:
-        biological_score += 0.3
-    else:
-        issues.append("No input nodes found")
-        recommendations.append("Add external signal inputs")
-    
-    # Check for reasonable network size
-    total_nodes = len(nodes)
-    if 5 <= total_nodes <= 200:
-        biological_score += 0.2
-    else:
-        if total_nodes < 5:
-            issues.append("Network too small for meaningful analysis")
-        else:
-            issues.append("Network very large - may be difficult to analyze")
+    for _, check, weight, requires in _VALIDATION_RULES:
+        if requires and not available[requires]:
+            continue
+        score, rule_issues, rule_recommendations = check(nodes, keyword_hits, topology_results, dynamics_results)
+        biological_score += score
+        max_score += weight
+        issues.extend(rule_issues)
+        recommendations.extend(rule_recommendations)
     
     # Normalize score
     if max_score > 0:
@@ -201,26 +230,134 @@ def validate_biological_plausibility(model_data: Dict[str, Any],
     else:
         biological_plausibility = 0.0
     
-    # Additional robustness checks
-    if dynamics_results:
-        robust_nodes = dynamics_results.get("robust_nodes", [])
-        if len(robust_nodes) == 0:
-            issues.append("No robust nodes found")
-            recommendations.append("Network may be too sensitive to perturbations")
+    input_nodes = nodes_by_type(model_data)["input"]
     
     return {
         "biological_plausibility": biological_plausibility,
+        "assessment": _PLAUSIBILITY_LEVELS[bisect.bisect_left(_PLAUSIBILITY_THRESHOLDS, biological_plausibility)]["assessment"],
         "issues": issues,
         "recommendations": recommendations,
         "validation_details": {
             "biological_score": biological_score,
             "max_score": max_score,
             "input_nodes_count": len(input_nodes),
-            "total_nodes_count": total_nodes
+            "total_nodes_count": len(nodes)
         }
     }
 
 
+def _check_p53_pathway(nodes, keyword_hits, topology_results, dynamics_results):
+    """Check for the p53 pathway and its DNA damage / apoptosis context"""
+    if "p53" not in nodes:
+        return 0.0, ["Missing p53 tumor suppressor pathway"], ["Consider adding p53-mediated DNA damage response"]
+    score = 0.5
+    if keyword_hits["DNA_damage"]:
+        score += 0.3
+    if keyword_hits["Apoptosis"]:
+        score += 0.2
+    return score, [], []
+
+
+def _check_cell_fate(nodes, keyword_hits, topology_results, dynamics_results):
+    """Check for cell fate decisions"""
+    if keyword_hits["Apoptosis"] and keyword_hits["Proliferation"]:
+        # Check if they are mutually exclusive (simple check)
+        # This is a placeholder - real validation would check logic
+        return 0.5 + 0.3, [], []
+    return 0.0, ["Apoptosis and proliferation may not be mutually exclusive"], ["Ensure proper cell fate decision logic"]
+
+
+def _check_dynamics_stability(nodes, keyword_hits, topology_results, dynamics_results):
+    """Score the share of stable nodes from the dynamics results"""
+    unstable_count = len(dynamics_results.get("unstable_nodes", []))
+    total_nodes = len(nodes)
+    if total_nodes == 0:
+        return 0.0, [], []
+    
+    score = (1.0 - (unstable_count / total_nodes)) * 0.5
+    if unstable_count > total_nodes * 0.5:
+        return score, ["Many unstable nodes detected"], ["Review network logic for stability"]
+    return score, [], []
+
+
+def _check_topology(nodes, keyword_hits, topology_results, dynamics_results):
+    """Score feedback loop count and connectivity from the topology results"""
+    score = 0.0
+    issues = []
+    recommendations = []
+    
+    cycles = topology_results.get("cycles", 0)
+    if cycles == 0:
+        score += 0.3
+    elif cycles < 3:
+        score += 0.2
+    else:
+        issues.append("Many feedback loops may cause instability")
+        recommendations.append("Review feedback loop necessity")
+    
+    # Check connectivity
+    if topology_results.get("connected", False):
+        score += 0.2
+    else:
+        issues.append("Network has disconnected components")
+        recommendations.append("Ensure all pathways are properly connected")
+    
+    return score, issues, recommendations
+
+
+def _check_inputs_and_size(nodes, keyword_hits, topology_results, dynamics_results):
+    """Check for input nodes and a reasonable network size"""
+    score = 0.0
+    issues = []
+    recommendations = []
+    
+    if any(info["type"] == "input" for info in nodes.values()):
+        score += 0.3
+    else:
+        issues.append("No input nodes found")
+        recommendations.append("Add external signal inputs")
+    
+    total_nodes = len(nodes)
+    if 5 <= total_nodes <= 200:
+        score += 0.2
+    elif total_nodes < 5:
+        issues.append("Network too small for meaningful analysis")
+    else:
+        issues.append("Network very large - may be difficult to analyze")
+    
+    return score, issues, recommendations
+
+
+def _check_robust_nodes(nodes, keyword_hits, topology_results, dynamics_results):
+    """Flag dynamics results without any robust nodes (not scored)"""
+    if len(dynamics_results.get("robust_nodes", [])) == 0:
+        return 0.0, ["No robust nodes found"], ["Network may be too sensitive to perturbations"]
+    return 0.0, [], []
+
+
+# Validation rules in reporting order: (name, check, weight, required analysis result)
+# A rule's weight counts towards max_score only when the rule applies
+_VALIDATION_RULES = [
+    ("p53_pathway", _check_p53_pathway, 1.0, None),
+    ("cell_fate", _check_cell_fate, 1.0, None),
+    ("dynamics_stability", _check_dynamics_stability, 1.0, "dynamics_results"),
+    ("topology", _check_topology, 1.0, "topology_results"),
+    ("inputs_and_size", _check_inputs_and_size, 1.0, None),
+    ("robust_nodes", _check_robust_nodes, 0.0, "dynamics_results"),
+]
+
+
+def _index_pathway_keywords(node_names) -> Dict[str, List[str]]:
+    """Map each pathway keyword to the node names containing it"""
+    keyword_hits = {keyword: [] for keyword in _PATHWAY_KEYWORDS}
+    # Find candidate names in one scan over all names, then split them by keyword
+    for match in _PATHWAY_NAME_PATTERN.finditer("\n".join(node_names)):
+        name = match.group(0)
+        for keyword in set(_PATHWAY_KEYWORD_PATTERN.findall(name)):
+            keyword_hits[keyword].append(name)
+    return keyword_hits
+
+
 # Tool definition for the registry
 TOOL_DEFINITION = {
     "name": "validate_biology",
@@ -6,162 +6,249 @@ A structured approach to gene network analysis with LLM integration using LangCh
 """
 
 import argparse
+import asyncio
+import hashlib
 import sys
 import os
+import textwrap
+from datetime import datetime
+from functools import cached_property
 from pathlib import Path
-from typing import List
+from typing import Callable, Dict, List, Tuple
 import logging
 
-# LangChain imports
-from langchain_openai import ChatOpenAI
+# LangChain is loaded on first use by create_llm
+from reasoning_agents.llm_client import DEFAULT_MODEL, TASK_MODEL_ENV, create_llm
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Pipeline report layout, dedented once so the markdown has no code-block indentation
+REPORT_TEMPLATE = textwrap.dedent("""\
+    # Gene Network Analysis Report
+
+    **Network:** {network}
+    **Analysis Date:** {analysis_date}
+    **Report Type:** Comprehensive Analysis Pipeline
+
+    ## Executive Summary
+
+    This report presents a comprehensive analysis of the gene network using multiple specialized agents. Each agent provides an independent evaluation in natural language, making the results accessible to both technical and biological researchers.
+
+    ## Detailed Analysis Results
+
+    {analysis_results}
+
+    ## Conclusion
+
+    The analysis pipeline has completed successfully. Each agent has provided its specialized evaluation above. This natural language format allows for easy interpretation and integration of results across different analytical perspectives.
+
+    ---
+    *Generated by Gene Network Quality Agent - Natural Language Pipeline*
+    """)
+
 class GeneAgent:
     """Main Gene Network Quality Agent with LangChain integration"""
 
-    def __init__(self, verbose: bool = False):
+    def __init__(self, verbose: bool = False, model: str = None):
         self.verbose = verbose
         if verbose:
             logger.setLevel(logging.DEBUG)
 
-        # OpenAI API key from environment variable
+        # OpenAI API key from environment variable; only the LLM modes need it
         self.openai_api_key = os.getenv('OPENAI_API_KEY')
+        self.model = model
+
+        # Clients for task-specific models, created on first use
+        self._task_llms = {}
+
+    @cached_property
+    def llm(self):
+        """LangChain ChatOpenAI client, created on first use so --default-pipeline never loads LangChain"""
         if not self.openai_api_key:
             logger.error("OPENAI_API_KEY environment variable not set")
             sys.exit(1)
 
         # Set up LangChain ChatOpenAI
         try:
-            self.llm = ChatOpenAI(
-                api_key=self.openai_api_key,
-                model="gpt-3.5-turbo",
-                temperature=0.1,
-                max_tokens=2000
-            )
-            logger.info("LangChain ChatOpenAI initialized")
+            llm = create_llm(self.model, api_key=self.openai_api_key)
         except ImportError:
             logger.error("LangChain packages not installed. Run: pip install langchain langchain-openai")
             sys.exit(1)
+        logger.info("LangChain ChatOpenAI initialized (%s)", llm.model_name)
+        return llm
+
+    def llm_for(self, task: str):
+        """The client for a task: its GENE_AGENT_<TASK>_MODEL override if set, otherwise the main client"""
+        model = os.getenv(TASK_MODEL_ENV[task])
+        if not model or model == self.llm.model_name:
+            return self.llm
+        if model not in self._task_llms:
+            self._task_llms[model] = create_llm(model, api_key=self.openai_api_key)
+            logger.info("Using %s for %s", model, task)
+        return self._task_llms[model]
 
 
 
 
 
-    def run_default_pipeline(self, model_path: str) -> str:
+    def run_default_pipeline(self, model_path: str, max_concurrency: int = 4, use_cache: bool = True) -> str:
         """
         Run analysis pipeline with natural language communication between agents
 
         Args:
             model_path: Path to .bnd network file
+            max_concurrency: Agents run at once within a stage (1 runs them one by one)
+            use_cache: Reuse stored agent results for a network file analyzed before with the same tools
 
         Returns:
             Path to generated report file
         """
-        logger.info(f"Running analysis pipeline on {model_path}")
+        logger.info("Running analysis pipeline on %s", model_path)
 
         # Dynamically discover and order analysis agents
-        from reasoning_agents.tool_executor import discover_available_tools
+        from reasoning_agents.tool_executor import discover_available_tools, get_execution_stages
         available_tools_dict = discover_available_tools()
 
-        # Sort tools by priority (higher priority first)
-        sorted_tools = sorted(
-            available_tools_dict.items(),
-            key=lambda x: x[1]['definition'].get('priority', 50),
-            reverse=True
-        )
-
-        agents = [
-            (tool_info['display_name'], tool_info['module'])
-            for _, tool_info in sorted_tools
+        # Tools grouped into dependency stages (priority order within each stage)
+        stages = [
+            [
+                (available_tools_dict[tool_name]['display_name'], available_tools_dict[tool_name]['function'])
+                for tool_name in stage
+            ]
+            for stage in get_execution_stages()
         ]
 
-        # Initialize with just the model path
-        context = f"Analyzing gene network: {model_path}"
-        analysis_results = []
-
-        # Run each agent and collect natural language results
-        for step, (agent_name, agent_module) in enumerate(agents, 1):
-            logger.info(f"Step {step}: {agent_name}...")
-
-            # Import and execute agent
-            module_parts = agent_module.split('.')
-            module = __import__(agent_module, fromlist=[module_parts[-1]])
-            agent_result = module.execute_natural_language(context, model_path)
-
-            # Collect the natural language evaluation
-            analysis_results.append(f"## {agent_name}\n{agent_result}\n")
+        # Only deterministic agents are stored; random simulations run fresh every time
+        cached_agents = [
+            tool_info['display_name'] for tool_info in available_tools_dict.values()
+            if tool_info['definition'].get('deterministic', True)
+        ]
+        cache_keys = self._stage_cache_keys(model_path, cached_agents) if use_cache else {}
 
-            # Update context for next agent
-            context += f"\n\nPrevious analysis from {agent_name}:\n{agent_result}"
+        # Run the agents and collect natural language results in plan order
+        analysis_results = asyncio.run(self._run_pipeline_stages(model_path, stages, max_concurrency, cache_keys))
 
         # Generate final report
         logger.info("Generating final report...")
         report_path = self._generate_natural_language_report(model_path, analysis_results)
 
-        logger.info(f"Analysis pipeline completed. Report: {report_path}")
+        logger.info("Analysis pipeline completed. Report: %s", report_path)
         return report_path
         
 
         
 
         
-    def _generate_natural_language_report(self, model_path: str, analysis_results: List[str]) -> str:
-        """Generate natural language report from agent evaluations"""
-
-        # Create reports directory
-        reports_dir = Path("reports")
-        reports_dir.mkdir(exist_ok=True)
-
-        # Generate timestamp
-        from datetime import datetime
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    def _stage_cache_keys(self, model_path: str, agent_names: List[str]) -> Dict[str, str]:
+        """
+        Key each agent's result by the network file's contents and the current tool and simulator code
+        Only agents whose output is a deterministic function of the network file may be keyed
+        """
+        from reasoning_agents.tool_executor import tools_fingerprint
 
-        # Create natural language report
-        report_content = f"""# Gene Network Analysis Report
+        try:
+            network_hash = hashlib.sha256(Path(model_path).read_bytes()).hexdigest()
+        except OSError:
+            # Missing or unreadable network; let the agents report the error uncached
+            return {}
+        fingerprint = tools_fingerprint()
+        return {
+            agent_name: hashlib.sha256(f"pipeline\0{agent_name}\0{fingerprint}\0{network_hash}".encode('utf-8')).hexdigest()
+            for agent_name in agent_names
+        }
+
+    async def _run_pipeline_stages(self, model_path: str, stages: List[List[Tuple[str, Callable[[str, str], str]]]],
+                                   max_concurrency: int = 4, cache_keys: Dict[str, str] = None) -> List[str]:
+        """
+        Run pipeline stages in order; the agents within a stage only depend on earlier
+        stages, so they run concurrently in worker threads (at most max_concurrency at once)
+        Agents with a stored result under their cache key are not run again
+        """
+        from reasoning_agents.response_cache import get_cached_response, store_response
+
+        semaphore = asyncio.Semaphore(max_concurrency)
+        cache_keys = cache_keys or {}
+
+        async def run_agent(step: int, agent_name: str, agent_function: Callable[[str, str], str], context: str) -> str:
+            cache = cache_keys.get(agent_name)
+            if cache:
+                agent_result = get_cached_response(cache)
+                if agent_result is not None:
+                    logger.info("Step %d: %s (stored result)", step, agent_name)
+                    return agent_result
+            async with semaphore:
+                logger.info("Step %d: %s...", step, agent_name)
+                agent_result = await asyncio.to_thread(agent_function, context, model_path)
+            # Failures ("**... Failed**: reason") may be transient, so only successes are kept
+            if cache and "Failed**:" not in agent_result.partition("\n")[0]:
+                store_response(cache, agent_result)
+            return agent_result
+
+        # Initialize with just the model path; earlier results are joined once per stage
+        context_parts = [f"Analyzing gene network: {model_path}"]
+        analysis_results = []
+        step = 0
 
-            **Network:** {Path(model_path).name}
-            **Analysis Date:** {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
-            **Report Type:** Comprehensive Analysis Pipeline
+        for stage in stages:
+            context = "\n\n".join(context_parts)
+            stage_results = await asyncio.gather(*(
+                run_agent(step + offset, agent_name, agent_function, context)
+                for offset, (agent_name, agent_function) in enumerate(stage, 1)
+            ))
+            step += len(stage)
 
-            ## Executive Summary
+            for (agent_name, _), agent_result in zip(stage, stage_results):
+                # Collect the natural language evaluation
+                analysis_results.append(f"## {agent_name}\n{agent_result}\n")
 
-            This report presents a comprehensive analysis of the gene network using multiple specialized agents. Each agent provides an independent evaluation in natural language, making the results accessible to both technical and biological researchers.
+                # Update context for the next stage
+                context_parts.append(f"Previous analysis from {agent_name}:\n{agent_result}")
 
-            ## Detailed Analysis Results
+        return analysis_results
 
-            {''.join(analysis_results)}
+    def _generate_natural_language_report(self, model_path: str, analysis_results: List[str]) -> str:
+        """Generate natural language report from agent evaluations"""
 
-            ## Conclusion
+        # Create reports directory
+        reports_dir = Path("reports")
+        reports_dir.mkdir(exist_ok=True)
 
-            The analysis pipeline has completed successfully. Each agent has provided its specialized evaluation above. This natural language format allows for easy interpretation and integration of results across different analytical perspectives.
+        # Generate timestamp (microseconds keep same-second reports apart)
+        now = datetime.now()
+        timestamp = now.strftime("%Y%m%d_%H%M%S_%f")
 
-            ---
-            *Generated by Gene Network Quality Agent - Natural Language Pipeline*
-            """
+        # Create natural language report
+        report_content = REPORT_TEMPLATE.format(
+            network=Path(model_path).name,
+            analysis_date=now.strftime("%Y-%m-%d %H:%M:%S"),
+            analysis_results=''.join(analysis_results)
+        )
 
         # Save natural language report
         report_path = reports_dir / f"analysis_report_{timestamp}.md"
-        with open(report_path, 'w') as f:
-            f.write(report_content)
+        report_path.write_text(report_content, encoding='utf-8')
 
-        logger.info(f"Natural language report: {report_path}")
+        logger.info("Natural language report: %s", report_path)
 
         return str(report_path)
 
 
 
+    def _biologist_summary_path(self, report_path: str, focus: str) -> str:
+        """Path of the biologist-friendly summary for a report and focus"""
+        return report_path.replace('.md', f'_biologist_summary_{focus.replace(" ", "_")}.md')
+
+    def _biologist_summary_header(self, report_path: str, focus: str) -> str:
+        """Heading written above the summary text"""
+        return f"# Gene Network Analysis Summary\n\n**Focus:** {focus}\n\n**Source Report:** {report_path}\n\n"
+
     def _save_biologist_summary(self, report_path: str, summary: str, focus: str) -> str:
         """Save biologist-friendly summary"""
-        summary_path = report_path.replace('.md', f'_biologist_summary_{focus.replace(" ", "_")}.md')
+        summary_path = self._biologist_summary_path(report_path, focus)
 
-        with open(summary_path, 'w') as f:
-            f.write(f"# Gene Network Analysis Summary\n\n")
-            f.write(f"**Focus:** {focus}\n\n")
-            f.write(f"**Source Report:** {report_path}\n\n")
-            f.write(summary)
+        Path(summary_path).write_text(self._biologist_summary_header(report_path, focus) + summary, encoding='utf-8')
 
         return summary_path
 
@@ -182,8 +269,14 @@ def main():
             # Ask specific question about analysis
             python gene_agent.py --refine report.yaml --ask "What are the key regulatory hubs?"
 
+            # Ask every question in a file (one per line) in one batch
+            python gene_agent.py --refine report.yaml --ask-file questions.txt
+
             # Create biologist summary
             python gene_agent.py --refine report.yaml --summarize "therapeutic targets"
+
+            # Create several summaries in one batch
+            python gene_agent.py --refine report.yaml --summarize-multi "therapeutic targets,pathways,hubs"
                     """
     )
 
@@ -197,12 +290,24 @@ def main():
                        help='Refine analysis using LLM review of existing report')
     parser.add_argument('--ask', metavar='QUESTION',
                        help='Ask specific question about the analysis (use with --refine)')
+    parser.add_argument('--ask-file', metavar='QUESTIONS_FILE',
+                       help='Answer every question in a file, one per line, concurrently (use with --refine)')
     parser.add_argument('--summarize', metavar='FOCUS',
                        help='Create biologist-friendly summary with given focus (use with --refine)')
+    parser.add_argument('--summarize-multi', metavar='FOCUSES',
+                       help='Create one summary per comma-separated focus, requested concurrently (use with --refine)')
 
     # Options
-    parser.add_argument('--model', default='gpt-3.5-turbo',
-                       help='AI model to use (default: gpt-3.5-turbo)')
+    parser.add_argument('--full-context', action='store_true',
+                       help='Send long reports unabridged with --ask/--ask-file/--summarize instead of a cached digest')
+    parser.add_argument('--no-cache', action='store_true',
+                       help='Re-run every pipeline agent instead of reusing stored deterministic results for an unchanged network')
+    parser.add_argument('--sequential', action='store_true',
+                       help='Run pipeline agents one at a time instead of concurrently within each stage')
+    parser.add_argument('--batch-api', action='store_true',
+                       help='Send --ask-file/--summarize-multi requests as an OpenAI Batch API job (half price, waits up to 24h)')
+    parser.add_argument('--model', default=DEFAULT_MODEL,
+                       help=f'AI model to use (default: {DEFAULT_MODEL}, or set GENE_AGENT_MODEL)')
     parser.add_argument('--verbose', action='store_true',
                        help='Enable verbose logging')
 
@@ -214,50 +319,79 @@ def main():
         return
 
     # Initialize agent
-    agent = GeneAgent(verbose=args.verbose)
+    agent = GeneAgent(verbose=args.verbose, model=args.model)
 
     try:
         if args.default_pipeline:
             if not args.network_file:
                 print("Error: Network file required for --default-pipeline")
                 sys.exit(1)
-            report_path = agent.run_default_pipeline(args.network_file)
+            report_path = agent.run_default_pipeline(args.network_file, max_concurrency=1 if args.sequential else 4,
+                                                     use_cache=not args.no_cache)
             print(f"Analysis complete. Report: {report_path}")
 
         elif args.refine:
-            # Load the report content
-            with open(args.refine, 'r') as f:
-                report_content = f.read()
+            # Load the report content (cached for the model path lookup below)
+            from reasoning_agents.tool_executor import extract_model_path_from_report, read_report
+            report_content = read_report(args.refine)
 
             # Extract model path for tool execution
-            from reasoning_agents.tool_executor import extract_model_path_from_report
             model_path = extract_model_path_from_report(args.refine)
 
+            if (args.ask or args.ask_file or args.summarize or args.summarize_multi) and not args.full_context:
+                # Long reports are condensed once so each question or summary sends a bounded prompt
+                from reasoning_agents.report_digest import condense_report
+                report_content = condense_report(report_content, agent.llm_for('digest'))
+
             if args.ask:
                 # Use question agent directly
                 from reasoning_agents.question_agent import execute_natural_language
-                answer = execute_natural_language(report_content, args.ask, model_path)
-                print(answer)
+                # The answer is printed as it streams in
+                execute_natural_language(report_content, args.ask, model_path, llm=agent.llm_for('question'), stream=True)
+
+            elif args.ask_file:
+                # All questions in one batched request, sharing the cached prompt prefix
+                from reasoning_agents.question_agent import execute_many
+                questions = [line.strip() for line in Path(args.ask_file).read_text(encoding='utf-8').splitlines() if line.strip()]
+                answers = execute_many(report_content, questions, model_path, llm=agent.llm_for('question'), use_batch_api=args.batch_api)
+
+                # Save the questions and answers
+                qa_path = args.refine.replace('.md', '_qa.md')
+                Path(qa_path).write_text(
+                    f"# Questions and Answers\n\n**Source Report:** {args.refine}\n\n" +
+                    "\n\n".join(f"## {question}\n\n{answer}" for question, answer in zip(questions, answers)) + "\n",
+                    encoding='utf-8'
+                )
+                print(f"Answers saved: {qa_path}")
 
             elif args.summarize:
-                # Use summary agent directly
+                # Use summary agent directly, streaming the summary into its file
+                # (and to the terminal with --verbose)
                 from reasoning_agents.summary_agent import execute_natural_language
-                summary = execute_natural_language(report_content, args.summarize)
-
-                # Save the summary
-                summary_path = args.refine.replace('.md', f'_biologist_summary_{args.summarize.replace(" ", "_")}.md')
-                with open(summary_path, 'w') as f:
-                    f.write(f"# Gene Network Analysis Summary\n\n")
-                    f.write(f"**Focus:** {args.summarize}\n\n")
-                    f.write(f"**Source Report:** {args.refine}\n\n")
-                    f.write(summary)
+                summary_path = agent._biologist_summary_path(args.refine, args.summarize)
+                with open(summary_path, 'w', encoding='utf-8') as summary_file:
+                    summary_file.write(agent._biologist_summary_header(args.refine, args.summarize))
+                    outputs = [summary_file, sys.stdout] if args.verbose else [summary_file]
+                    execute_natural_language(report_content, args.summarize, llm=agent.llm_for('summary'), outputs=outputs)
+                if args.verbose:
+                    print()
                 print(f"Summary created: {summary_path}")
 
+            elif args.summarize_multi:
+                # Summaries for every focus in one batched request
+                from reasoning_agents.summary_agent import execute_many
+                focuses = [focus.strip() for focus in args.summarize_multi.split(',') if focus.strip()]
+                summaries = execute_many(report_content, focuses, llm=agent.llm_for('summary'), use_batch_api=args.batch_api)
+
+                for focus, summary in zip(focuses, summaries):
+                    summary_path = agent._save_biologist_summary(args.refine, summary, focus)
+                    print(f"Summary created: {summary_path}")
+
             else:
                 # Use refinement agent directly
                 from reasoning_agents.refinement_agent import execute_natural_language
-                suggestions = execute_natural_language(report_content, model_path=model_path)
-                print(suggestions)
+                # The suggestions are printed as they stream in
+                execute_natural_language(report_content, model_path=model_path, llm=agent.llm_for('refine'), stream=True)
 
         else:
             print("Error: Please specify a mode (--default-pipeline or --refine)")
@@ -265,7 +399,7 @@ def main():
             sys.exit(1)
 
     except Exception as e:
-        logger.error(f"Error: {e}")
+        logger.error("Error: %s", e)
         if args.verbose:
             import traceback
             traceback.print_exc()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Batch API - Runs many chat completions through OpenAI's Batch API at half the price of live requests
+Results arrive within the 24h completion window, so this suits --ask-file and --summarize-multi runs
+that are not waited on interactively
+"""
+
+import json
+import logging
+import time
+from typing import List, Union
+
+from .llm_client import LLM_MAX_TOKENS, LLM_TEMPERATURE
+
+logger = logging.getLogger(__name__)
+
+# Seconds between batch status checks
+POLL_INTERVAL = 30
+
+# Batch states after which no more results will arrive
+_FINAL_STATUSES = {"completed", "failed", "expired", "cancelled"}
+
+def _request_lines(model: str, message_lists: List[list]) -> bytes:
+    """One /v1/chat/completions request per line, identified by its position"""
+    return "".join(
+        json.dumps({
+            "custom_id": str(index),
+            "method": "POST",
+            "url": "/v1/chat/completions",
+            "body": {
+                "model": model,
+                "messages": messages,
+                "temperature": LLM_TEMPERATURE,
+                "max_tokens": LLM_MAX_TOKENS
+            }
+        }) + "\n"
+        for index, messages in enumerate(message_lists)
+    ).encode("utf-8")
+
+def run_batch(model: str, message_lists: List[list], poll_interval: float = POLL_INTERVAL) -> List[Union[str, Exception]]:
+    """
+    Submit chat completions as one batch job and wait for it to finish
+
+    Args:
+        model: Model name for every request
+        message_lists: One chat message list per request
+        poll_interval: Seconds between status checks
+
+    Returns:
+        The reply text, or an exception for requests that failed or never ran, in request order
+    """
+    # Imported here like ChatOpenAI, so only batch runs load the client
+    from openai import OpenAI
+
+    client = OpenAI()
+    input_file = client.files.create(file=("requests.jsonl", _request_lines(model, message_lists)), purpose="batch")
+    batch = client.batches.create(input_file_id=input_file.id, endpoint="/v1/chat/completions", completion_window="24h")
+    logger.info("Submitted batch %s with %d requests", batch.id, len(message_lists))
+
+    while batch.status not in _FINAL_STATUSES:
+        time.sleep(poll_interval)
+        batch = client.batches.retrieve(batch.id)
+        logger.info("Batch %s: %s", batch.id, batch.status)
+
+    results: List[Union[str, Exception]] = [
+        RuntimeError(f"Batch {batch.id} {batch.status} before this request ran") for _ in message_lists
+    ]
+    for file_id in (batch.output_file_id, batch.error_file_id):
+        if not file_id:
+            continue
+        for line in client.files.content(file_id).text.splitlines():
+            record = json.loads(line)
+            response = record.get("response") or {}
+            if response.get("status_code") == 200:
+                results[int(record["custom_id"])] = response["body"]["choices"][0]["message"]["content"]
+            else:
+                error = record.get("error") or response.get("body", {}).get("error")
+                results[int(record["custom_id"])] = RuntimeError(f"Batch request failed: {error}")
+    return results
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+LLM Client - Shared ChatOpenAI setup for the agent and the reasoning agents
+"""
+
+import os
+import sys
+from typing import List, Union
+
+# Model used unless --model is given; override with GENE_AGENT_MODEL
+DEFAULT_MODEL = os.getenv('GENE_AGENT_MODEL', 'gpt-4o-mini')
+
+# Per-task model overrides; unset tasks use the --model/DEFAULT_MODEL client, e.g.
+# GENE_AGENT_SUMMARY_MODEL=gpt-4o for publication-ready summaries
+TASK_MODEL_ENV = {
+    "refine": "GENE_AGENT_REFINE_MODEL",
+    "question": "GENE_AGENT_QUESTION_MODEL",
+    "summary": "GENE_AGENT_SUMMARY_MODEL",
+    "digest": "GENE_AGENT_DIGEST_MODEL",
+}
+
+# Attempts after the first failed request before an error reaches the agents
+LLM_MAX_RETRIES = 5
+
+# Greedy decoding, so a cached response matches what a fresh call would return
+LLM_TEMPERATURE = 0
+LLM_MAX_TOKENS = 2000
+
+def create_llm(model: str = None, api_key: str = None):
+    """
+    Build a ChatOpenAI client
+
+    Args:
+        model: Model name (defaults to DEFAULT_MODEL)
+        api_key: OpenAI API key (defaults to OPENAI_API_KEY)
+
+    Returns:
+        The client, or None when no API key is available
+    """
+    api_key = api_key or os.getenv('OPENAI_API_KEY')
+    if not api_key:
+        return None
+
+    # Imported here so --help and argument errors don't pay for loading LangChain
+    from langchain_openai import ChatOpenAI
+
+    return ChatOpenAI(
+        api_key=api_key,
+        model=model or DEFAULT_MODEL,
+        temperature=LLM_TEMPERATURE,
+        max_tokens=LLM_MAX_TOKENS,
+        # The OpenAI client retries rate limits (honouring retry-after) and transient
+        # 5xx/connection errors with exponential backoff and jitter
+        max_retries=LLM_MAX_RETRIES
+    )
+
+def prompt_messages(system_prompt: str, user_prompt: str) -> list:
+    """
+    Chat messages for a fixed system prompt and the per-call input
+    OpenAI caches repeated prompt prefixes server-side, so the system prompt must
+    stay byte-identical across calls and everything that varies goes in the user turn
+    """
+    return [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": user_prompt}
+    ]
+
+def complete_many(llm, message_lists: List[list], max_concurrency: int = 4,
+                  use_batch_api: bool = False) -> List[Union[str, Exception]]:
+    """
+    Complete several prompts, either concurrently or as one Batch API job
+
+    Args:
+        llm: Shared ChatOpenAI client
+        message_lists: One chat message list per request
+        max_concurrency: Live requests in flight at once
+        use_batch_api: Submit through the Batch API (half price, results within 24h)
+
+    Returns:
+        The reply text, or the exception raised, per request in order
+    """
+    if use_batch_api:
+        from .batch_api import run_batch
+        return run_batch(llm.model_name, message_lists)
+    results = llm.batch(message_lists, config={"max_concurrency": max_concurrency}, return_exceptions=True)
+    return [result if isinstance(result, Exception) else result.content for result in results]
+
+def stream_completion(llm, messages: list, outputs: list = None) -> str:
+    """
+    Write the model's reply to each output (stdout by default) as it is generated
+    and return the full text
+    """
+    outputs = outputs or [sys.stdout]
+    chunks = []
+    for chunk in llm.stream(messages):
+        for output in outputs:
+            output.write(chunk.content)
+            output.flush()
+        chunks.append(chunk.content)
+    return "".join(chunks)
@@ -3,17 +3,58 @@
 Question Agent - Answers specific questions about analysis reports
 """
 
-import os
 import logging
-from pathlib import Path
+from functools import lru_cache
+from typing import List
 
-# LangChain imports
-from langchain_openai import ChatOpenAI
-from langchain_community.callbacks import get_openai_callback
+from .llm_client import complete_many, create_llm, prompt_messages, stream_completion
 
 logger = logging.getLogger(__name__)
 
-def execute_natural_language(report_content: str, question: str, model_path: str = None) -> str:
+# Fixed instructions sent as the system message; only the tool list varies, and only
+# when tools are added, so the prefix is cached across calls
+QUESTION_SYSTEM_PROMPT = """You are an expert in gene network analysis. Please answer the question that follows the analysis report, based on the information in the report.
+
+Available analysis tools:
+{available_tools}
+
+Please provide a detailed, accurate answer based on the information in the report. If the report doesn't contain enough information to answer the question, please state that clearly and suggest what additional analysis might be needed.
+
+If running specific analysis tools would help answer the question better, mention which tools should be executed and why.
+
+Respond in clear, natural language suitable for researchers."""
+
+# Report before question, so questions about the same report also share the report prefix
+QUESTION_PROMPT = """Analysis Report:
+{report_content}
+
+Question: {question}"""
+
+@lru_cache(maxsize=8)
+def _system_prompt(tools_block: str) -> str:
+    """The system prompt for a tool list, rendered once per distinct list"""
+    return QUESTION_SYSTEM_PROMPT.format(available_tools=tools_block)
+
+def _complete_answer(response_text: str, available_tools_dict: dict, model_path: str = None) -> str:
+    """Run the tools recommended in an answer and append their results"""
+    from .tool_executor import extract_tool_recommendations, execute_recommended_tools
+
+    # Parse response to extract tool recommendations
+    recommended_tools = extract_tool_recommendations(response_text, available_tools_dict)
+
+    # Execute recommended tools if model_path is available
+    if recommended_tools and model_path:
+        logger.info(f"Question agent executing recommended tools: {recommended_tools}")
+        additional_analysis = execute_recommended_tools(model_path, recommended_tools)
+        if additional_analysis:
+            response_text += f"\n\n## Additional Analysis Results\n{additional_analysis}"
+    elif recommended_tools:
+        logger.info(f"Question agent identified tools to run: {recommended_tools}, but no model path provided")
+
+    return response_text
+
+def execute_natural_language(report_content: str, question: str, model_path: str = None, llm=None,
+                             stream: bool = False) -> str:
     """
     Answer specific question about the natural language report with automatic tool execution
 
@@ -21,70 +62,118 @@ def execute_natural_language(report_content: str, question: str, model_path: str
         report_content: The analysis report content
         question: The specific question to answer
         model_path: Path to the model file for tool execution
+        llm: Shared ChatOpenAI client; a new one is created when omitted
+        stream: Print the answer to stdout as it is generated (including any tool results)
 
     Returns:
         Complete answer including executed tool results
     """
     
-    # Initialize LLM
-    openai_api_key = os.getenv('OPENAI_API_KEY')
-    if not openai_api_key:
-        return "Error: OPENAI_API_KEY not set"
-
-    llm = ChatOpenAI(
-        api_key=openai_api_key,
-        model="gpt-3.5-turbo",
-        temperature=0.1,
-        max_tokens=2000
-    )
+    # Initialize LLM unless the caller shares one
+    if llm is None:
+        llm = create_llm()
+        if llm is None:
+            error = "Error: OPENAI_API_KEY not set"
+            if stream:
+                print(error)
+            return error
 
     # Import tool execution utilities
-    from .tool_executor import discover_available_tools, extract_tool_recommendations, execute_recommended_tools
+    from .tool_executor import available_tools_block, discover_available_tools
+    from .response_cache import cache_key, get_cached_response, store_response
 
     # Dynamically discover available tools
     available_tools_dict = discover_available_tools()
-    available_tools = [
-        f"{tool_info['display_name']} - {tool_info['definition']['description']}"
-        for tool_info in available_tools_dict.values()
-    ]
+    tools_block = available_tools_block()
 
-    prompt = f"""You are an expert in gene network analysis. Please answer the following question based on the analysis report provided.
-
-Available analysis tools:
-{chr(10).join([f"- {tool}" for tool in available_tools])}
+    system_prompt = _system_prompt(tools_block)
+    messages = prompt_messages(system_prompt, QUESTION_PROMPT.format(report_content=report_content, question=question))
 
-Question: {question}
-
-Analysis Report:
-{report_content}
+    try:
+        # Reuse the answer from an earlier run on the same report when available
+        cache = cache_key("question_agent", llm.model_name, report_content, question, system_prompt)
+        response_text = get_cached_response(cache)
+        if response_text is None:
+            if stream:
+                response_text = stream_completion(llm, messages)
+            else:
+                # Use simple chain without complex parsing
+                result = llm.invoke(messages)
+                response_text = result.content
+            store_response(cache, response_text)
+        elif stream:
+            print(response_text, end="")
+        if stream:
+            print(flush=True)
+
+        answer = _complete_answer(response_text, available_tools_dict, model_path)
+        if stream and len(answer) > len(response_text):
+            # Finish the streamed output with the tool results that were appended
+            print(answer[len(response_text):].lstrip("\n"))
+        return answer
+    except Exception as e:
+        logger.error(f"Question answering failed: {e}")
+        error = f"Error processing question: {e}"
+        if stream:
+            # The caller relies on the streamed output, so the error must reach it too
+            print(error)
+        return error
+
+def execute_many(report_content: str, questions: List[str], model_path: str = None, llm=None,
+                 max_concurrency: int = 4, use_batch_api: bool = False) -> List[str]:
+    """
+    Answer several questions about the same report, sending the uncached ones as one batch
 
-Please provide a detailed, accurate answer based on the information in the report. If the report doesn't contain enough information to answer the question, please state that clearly and suggest what additional analysis might be needed.
+    Args:
+        report_content: The analysis report content
+        questions: The questions to answer, in order
+        model_path: Path to the model file for tool execution
+        llm: Shared ChatOpenAI client; a new one is created when omitted
+        max_concurrency: Requests in flight at once; keep it within the account's
+            OpenAI requests- and tokens-per-minute limits
+        use_batch_api: Send the uncached questions as an OpenAI Batch API job instead
+            (half price, but results can take up to 24 hours)
 
-If running specific analysis tools would help answer the question better, mention which tools should be executed and why.
+    Returns:
+        One complete answer (or error message) per question, in the same order
+    """
+    if llm is None:
+        llm = create_llm()
+        if llm is None:
+            return ["Error: OPENAI_API_KEY not set" for _ in questions]
 
-Respond in clear, natural language suitable for researchers."""
+    from .tool_executor import available_tools_block, discover_available_tools
+    from .response_cache import cache_key, get_cached_response, store_response
 
-    try:
-        # Use simple chain without complex parsing
-        result = llm.invoke([{"role": "user", "content": prompt}])
-
-        # Parse response to extract tool recommendations
-        response_text = result.content
-        recommended_tools = extract_tool_recommendations(response_text, available_tools_dict)
-
-        # Execute recommended tools if model_path is available
-        if recommended_tools and model_path:
-            logger.info(f"Question agent executing recommended tools: {recommended_tools}")
-            additional_analysis = execute_recommended_tools(model_path, recommended_tools)
-            if additional_analysis:
-                response_text += f"\n\n## Additional Analysis Results\n{additional_analysis}"
-        elif recommended_tools:
-            logger.info(f"Question agent identified tools to run: {recommended_tools}, but no model path provided")
-
-        return response_text
-    except Exception as e:
-        logger.error(f"Question answering failed: {e}")
-        return f"Error processing question: {e}"
+    available_tools_dict = discover_available_tools()
+    system_prompt = _system_prompt(available_tools_block())
+
+    keys = [cache_key("question_agent", llm.model_name, report_content, question, system_prompt) for question in questions]
+    responses = [get_cached_response(key) for key in keys]
+    pending = [index for index, response in enumerate(responses) if response is None]
+
+    failed = set()
+    if pending:
+        results = complete_many(
+            llm,
+            [prompt_messages(system_prompt, QUESTION_PROMPT.format(report_content=report_content, question=questions[index]))
+             for index in pending],
+            max_concurrency=max_concurrency,
+            use_batch_api=use_batch_api
+        )
+        for index, result in zip(pending, results):
+            if isinstance(result, Exception):
+                logger.error(f"Question answering failed: {result}")
+                failed.add(index)
+                responses[index] = f"Error processing question: {result}"
+            else:
+                responses[index] = result
+                store_response(keys[index], result)
+
+    return [
+        response_text if index in failed else _complete_answer(response_text, available_tools_dict, model_path)
+        for index, response_text in enumerate(responses)
+    ]
 
 
 
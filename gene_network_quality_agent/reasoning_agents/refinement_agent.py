@@ -3,17 +3,39 @@
 Refinement Agent - Provides analysis refinement suggestions
 """
 
-import os
 import logging
-from pathlib import Path
+from functools import lru_cache
 
-# LangChain imports
-from langchain_openai import ChatOpenAI
-from langchain_community.callbacks import get_openai_callback
+from .llm_client import create_llm, prompt_messages, stream_completion
 
 logger = logging.getLogger(__name__)
 
-def execute_natural_language(report_content: str, context: str = "", model_path: str = None) -> str:
+# Fixed instructions sent as the system message; only the tool list varies, and only
+# when tools are added, so the prefix is cached across calls
+REFINEMENT_SYSTEM_PROMPT = """You are an expert in gene network analysis. Please review the analysis report you are given and provide suggestions for improvement or additional insights.
+
+Available analysis tools:
+{available_tools}
+
+Please provide:
+1. Key strengths of the current analysis
+2. Areas that could be improved or expanded
+3. Specific suggestions for additional analysis
+4. Any potential concerns or limitations
+5. If additional tool execution would be helpful, specify which tools should be run and why
+
+Respond in clear, natural language suitable for researchers."""
+
+REFINEMENT_PROMPT = """Report to review:
+{report_content}"""
+
+@lru_cache(maxsize=8)
+def _system_prompt(tools_block: str) -> str:
+    """The system prompt for a tool list, rendered once per distinct list"""
+    return REFINEMENT_SYSTEM_PROMPT.format(available_tools=tools_block)
+
+def execute_natural_language(report_content: str, context: str = "", model_path: str = None, llm=None,
+                             stream: bool = False) -> str:
     """
     Analyze report and provide refinement suggestions with automatic tool execution
 
@@ -21,57 +43,53 @@ def execute_natural_language(report_content: str, context: str = "", model_path:
         report_content: The analysis report content
         context: Additional context (unused for this agent)
         model_path: Path to the model file for tool execution
+        llm: Shared ChatOpenAI client; a new one is created when omitted
+        stream: Print the suggestions to stdout as they are generated (including any tool results)
 
     Returns:
         Complete refinement analysis including executed tool results
     """
     
-    # Initialize LLM
-    openai_api_key = os.getenv('OPENAI_API_KEY')
-    if not openai_api_key:
-        return "Error: OPENAI_API_KEY not set"
-
-    llm = ChatOpenAI(
-        api_key=openai_api_key,
-        model="gpt-3.5-turbo",
-        temperature=0.1,
-        max_tokens=2000
-    )
+    # Initialize LLM unless the caller shares one
+    if llm is None:
+        llm = create_llm()
+        if llm is None:
+            error = "Error: OPENAI_API_KEY not set"
+            if stream:
+                print(error)
+            return error
 
     # Import tool execution utilities
-    from .tool_executor import discover_available_tools, extract_tool_recommendations, execute_recommended_tools, extract_model_path_from_report
+    from .tool_executor import available_tools_block, discover_available_tools, extract_tool_recommendations, execute_recommended_tools
+    from .response_cache import cache_key, get_cached_response, store_response
 
     # Dynamically discover available tools
     available_tools_dict = discover_available_tools()
-    available_tools = [
-        f"{tool_info['display_name']} - {tool_info['definition']['description']}"
-        for tool_info in available_tools_dict.values()
-    ]
+    tools_block = available_tools_block()
 
     # Create prompt for refinement suggestions
-    prompt = f"""You are an expert in gene network analysis. Please review this analysis report and provide suggestions for improvement or additional insights.
-
-Available analysis tools:
-{chr(10).join([f"- {tool}" for tool in available_tools])}
-
-Report to review:
-{report_content}
-
-Please provide:
-1. Key strengths of the current analysis
-2. Areas that could be improved or expanded
-3. Specific suggestions for additional analysis
-4. Any potential concerns or limitations
-5. If additional tool execution would be helpful, specify which tools should be run and why
-
-Respond in clear, natural language suitable for researchers."""
+    system_prompt = _system_prompt(tools_block)
+    messages = prompt_messages(system_prompt, REFINEMENT_PROMPT.format(report_content=report_content))
 
     try:
-        # Use simple chain without complex parsing
-        result = llm.invoke([{"role": "user", "content": prompt}])
+        # Reuse the answer from an earlier run on the same report when available
+        cache = cache_key("refinement_agent", llm.model_name, report_content, system_prompt)
+        response_text = get_cached_response(cache)
+        if response_text is None:
+            if stream:
+                response_text = stream_completion(llm, messages)
+            else:
+                # Use simple chain without complex parsing
+                result = llm.invoke(messages)
+                response_text = result.content
+            store_response(cache, response_text)
+        elif stream:
+            print(response_text, end="")
+        if stream:
+            print(flush=True)
+        streamed_length = len(response_text)
 
         # Parse response to extract tool recommendations
-        response_text = result.content
         recommended_tools = extract_tool_recommendations(response_text, available_tools_dict)
 
         # Execute recommended tools if model_path is available
@@ -83,10 +101,17 @@ Respond in clear, natural language suitable for researchers."""
         elif recommended_tools:
             logger.info(f"Refinement agent identified tools to run: {recommended_tools}, but no model path provided")
 
+        if stream and len(response_text) > streamed_length:
+            # Finish the streamed output with the tool results that were appended
+            print(response_text[streamed_length:].lstrip("\n"))
         return response_text
     except Exception as e:
         logger.error(f"Refinement suggestions failed: {e}")
-        return f"Error generating refinement suggestions: {e}"
+        error = f"Error generating refinement suggestions: {e}"
+        if stream:
+            # The caller relies on the streamed output, so the error must reach it too
+            print(error)
+        return error
 
 
 
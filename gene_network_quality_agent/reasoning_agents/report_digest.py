@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Report Digest - Condenses long analysis reports before they are sent with every question or summary
+"""
+
+import logging
+import re
+from typing import List
+
+from .llm_client import prompt_messages
+from .response_cache import cache_key, get_cached_response, store_response
+
+logger = logging.getLogger(__name__)
+
+# Reports up to this many characters (roughly 3000 tokens) are sent unchanged
+REPORT_CHAR_BUDGET = 12000
+
+# Report sections start at second-level markdown headings
+_SECTION_PATTERN = re.compile(r"(?m)^(?=## )")
+
+DIGEST_SYSTEM_PROMPT = """You are an expert in gene network analysis. Condense the part of a gene network analysis report you are given into a compact digest.
+
+Keep every section heading, every number, node name and tool name, and every finding, warning and recommendation. Drop repetition, filler and boilerplate explanations.
+
+Respond with the digest only, in markdown."""
+
+DIGEST_PROMPT = """Report excerpt:
+{excerpt}"""
+
+def _report_chunks(report_content: str, budget: int) -> List[str]:
+    """Split a report at its sections and pack consecutive sections into chunks of at most budget characters"""
+    chunks = []
+    current = ""
+    for section in _SECTION_PATTERN.split(report_content):
+        # Sections longer than the budget are cut into budget-sized pieces
+        for start in range(0, len(section), budget):
+            piece = section[start:start + budget]
+            if current and len(current) + len(piece) > budget:
+                chunks.append(current)
+                current = ""
+            current += piece
+    if current:
+        chunks.append(current)
+    return chunks
+
+def _condense(llm, excerpts: List[str]) -> List[str]:
+    """Condense excerpts concurrently, one request each"""
+    results = llm.batch(
+        [prompt_messages(DIGEST_SYSTEM_PROMPT, DIGEST_PROMPT.format(excerpt=excerpt)) for excerpt in excerpts],
+        config={"max_concurrency": 4}
+    )
+    return [result.content for result in results]
+
+def condense_report(report_content: str, llm, budget: int = REPORT_CHAR_BUDGET) -> str:
+    """
+    Map-reduce a long report down to about budget characters; shorter reports are returned unchanged
+    The digest is cached per report and model, so it is built once and shared by later questions and summaries
+
+    Args:
+        report_content: The analysis report content
+        llm: Shared ChatOpenAI client
+        budget: Largest report, in characters, that is sent as-is
+
+    Returns:
+        The report or its digest; the full report if condensing fails
+    """
+    if len(report_content) <= budget:
+        return report_content
+
+    cache = cache_key("report_digest", llm.model_name, report_content, str(budget), DIGEST_SYSTEM_PROMPT)
+    digest = get_cached_response(cache)
+    if digest is not None:
+        return digest
+
+    try:
+        logger.info("Condensing %d-character report to about %d characters", len(report_content), budget)
+        # Map: condense each chunk of sections
+        digest = "\n\n".join(_condense(llm, _report_chunks(report_content, budget)))
+        # Reduce: merge the partial digests when together they are still over budget
+        if len(digest) > budget:
+            digest = _condense(llm, [digest])[0]
+    except Exception as e:
+        logger.warning("Report condensing failed, using the full report: %s", e)
+        return report_content
+
+    store_response(cache, digest)
+    return digest
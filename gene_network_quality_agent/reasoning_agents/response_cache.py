@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Response Cache - Reuses LLM responses for repeated questions about the same report,
+and pipeline agent results for networks that were already analyzed
+"""
+
+import hashlib
+import logging
+import os
+import re
+import sqlite3
+import time
+from contextlib import closing
+from pathlib import Path
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+# Shared across CLI runs; override the location with GENE_AGENT_CACHE
+CACHE_PATH = Path(os.getenv("GENE_AGENT_CACHE", ".gene_agent_cache.sqlite"))
+
+# Entries older than this many days are ignored and pruned; override with GENE_AGENT_CACHE_MAX_AGE_DAYS
+CACHE_MAX_AGE_DAYS = float(os.getenv("GENE_AGENT_CACHE_MAX_AGE_DAYS", "30"))
+
+# Bumped whenever the table layout changes; databases from older versions are emptied
+_SCHEMA_VERSION = 1
+
+_WHITESPACE_PATTERN = re.compile(r"\s+")
+
+def normalize_query(text: str) -> str:
+    """Fold case and whitespace so trivially different questions share an entry"""
+    return _WHITESPACE_PATTERN.sub(" ", text).strip().casefold()
+
+def cache_key(agent: str, model: str, report_content: str, *query_parts: str) -> str:
+    """
+    Key a response by agent, model, the exact report content and the normalized query
+    The report is hashed as-is so answers never leak across different reports; callers
+    include their system prompt in the query so editing the instructions invalidates entries
+    """
+    report_hash = hashlib.sha256(report_content.encode("utf-8")).hexdigest()
+    parts = [agent, model, report_hash] + [normalize_query(part) for part in query_parts]
+    return hashlib.sha256("\0".join(parts).encode("utf-8")).hexdigest()
+
+def _connect() -> sqlite3.Connection:
+    """Open the cache database, creating (or replacing an outdated) table on first use"""
+    connection = sqlite3.connect(CACHE_PATH)
+    if connection.execute("PRAGMA user_version").fetchone()[0] != _SCHEMA_VERSION:
+        with connection:
+            connection.execute("DROP TABLE IF EXISTS responses")
+            connection.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
+    connection.execute(
+        "CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, response TEXT NOT NULL, created REAL NOT NULL)"
+    )
+    return connection
+
+def _oldest_valid_time() -> float:
+    """Creation time before which entries count as expired"""
+    return time.time() - CACHE_MAX_AGE_DAYS * 86400
+
+def get_cached_response(key: str) -> Optional[str]:
+    """Return the stored response for a key, or None on a miss, an expired entry or a cache error"""
+    try:
+        with closing(_connect()) as connection, connection:
+            row = connection.execute(
+                "SELECT response FROM responses WHERE key = ? AND created >= ?", (key, _oldest_valid_time())
+            ).fetchone()
+    except sqlite3.Error as e:
+        logger.warning("Response cache unavailable: %s", e)
+        return None
+    if row is not None:
+        logger.info("Using cached LLM response")
+        return row[0]
+    return None
+
+def store_response(key: str, response: str) -> None:
+    """Store a response and prune expired entries; cache errors are logged and otherwise ignored"""
+    try:
+        with closing(_connect()) as connection, connection:
+            connection.execute("DELETE FROM responses WHERE created < ?", (_oldest_valid_time(),))
+            connection.execute(
+                "INSERT OR REPLACE INTO responses (key, response, created) VALUES (?, ?, ?)", (key, response, time.time())
+            )
+    except sqlite3.Error as e:
+        logger.warning("Could not store response in cache: %s", e)
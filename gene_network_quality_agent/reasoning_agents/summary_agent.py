@@ -3,60 +3,121 @@
 Summary Agent - Generates focused biologist-friendly summaries
 """
 
-import os
 import logging
+from typing import List
 
-# LangChain imports
-from langchain_openai import ChatOpenAI
-from langchain_community.callbacks import get_openai_callback
+from .llm_client import complete_many, create_llm, prompt_messages, stream_completion
+from .response_cache import cache_key, get_cached_response, store_response
 
 logger = logging.getLogger(__name__)
 
-def execute_natural_language(report_content: str, focus: str) -> str:
+# Fixed instructions sent as the system message, so the prefix is cached across calls
+SUMMARY_SYSTEM_PROMPT = """You are an expert biologist and researcher. Please create a focused summary of the gene network analysis report you are given, with emphasis on the focus area that follows it.
+
+Create a comprehensive, publication-ready summary that:
+1. Highlights key findings relevant to the focus area
+2. Explains biological significance and implications
+3. Identifies potential therapeutic targets or research directions
+4. Uses language appropriate for biological researchers
+5. Focuses specifically on aspects related to the focus area
+
+Format the summary in clear sections with markdown formatting."""
+
+# Report before focus, so summaries of the same report also share the report prefix
+SUMMARY_PROMPT = """Analysis Report:
+{report_content}
+
+Focus: {focus}"""
+
+def execute_natural_language(report_content: str, focus: str, llm=None, outputs: list = None) -> str:
     """
     Generate focused biologist-friendly summary from natural language report
     
     Args:
         report_content: The analysis report content
         focus: The focus area for the summary
+        llm: Shared ChatOpenAI client; a new one is created when omitted
+        outputs: Open text streams (e.g. the summary file) the summary is written
+            to as it is generated
         
     Returns:
         Focused summary text
     """
     
-    # Initialize LLM
-    openai_api_key = os.getenv('OPENAI_API_KEY')
-    if not openai_api_key:
-        return "Error: OPENAI_API_KEY not set"
-    
-    llm = ChatOpenAI(
-        api_key=openai_api_key,
-        model="gpt-3.5-turbo",
-        temperature=0.1,
-        max_tokens=2000
-    )
-
-    prompt = f"""You are an expert biologist and researcher. Please create a focused summary of this gene network analysis report with emphasis on: {focus}
-
-Analysis Report:
-{report_content}
-
-Create a comprehensive, publication-ready summary that:
-1. Highlights key findings relevant to {focus}
-2. Explains biological significance and implications
-3. Identifies potential therapeutic targets or research directions
-4. Uses language appropriate for biological researchers
-5. Focuses specifically on aspects related to {focus}
+    # Initialize LLM unless the caller shares one
+    if llm is None:
+        llm = create_llm()
+        if llm is None:
+            return "Error: OPENAI_API_KEY not set"
 
-Format the summary in clear sections with markdown formatting."""
+    messages = prompt_messages(SUMMARY_SYSTEM_PROMPT, SUMMARY_PROMPT.format(report_content=report_content, focus=focus))
 
     try:
-        # Use simple chain without complex parsing
-        result = llm.invoke([{"role": "user", "content": prompt}])
-        return result.content
+        # Reuse the summary from an earlier run on the same report when available
+        cache = cache_key("summary_agent", llm.model_name, report_content, focus, SUMMARY_SYSTEM_PROMPT)
+        summary = get_cached_response(cache)
+        if summary is None:
+            if outputs:
+                summary = stream_completion(llm, messages, outputs)
+            else:
+                # Use simple chain without complex parsing
+                result = llm.invoke(messages)
+                summary = result.content
+            store_response(cache, summary)
+        elif outputs:
+            for output in outputs:
+                output.write(summary)
+        return summary
     except Exception as e:
         logger.error(f"Summary generation failed: {e}")
-        return f"Error generating summary: {e}"
+        error = f"Error generating summary: {e}"
+        for output in outputs or []:
+            output.write(error)
+        return error
+
+def execute_many(report_content: str, focuses: List[str], llm=None, max_concurrency: int = 4,
+                 use_batch_api: bool = False) -> List[str]:
+    """
+    Generate summaries of the same report for several focus areas, sending the uncached ones as one batch
+
+    Args:
+        report_content: The analysis report content
+        focuses: The focus areas, in order
+        llm: Shared ChatOpenAI client; a new one is created when omitted
+        max_concurrency: Requests in flight at once; keep it within the account's
+            OpenAI requests- and tokens-per-minute limits
+        use_batch_api: Send the uncached focuses as an OpenAI Batch API job instead
+            (half price, but results can take up to 24 hours)
+
+    Returns:
+        One summary (or error message) per focus, in the same order
+    """
+    if llm is None:
+        llm = create_llm()
+        if llm is None:
+            return ["Error: OPENAI_API_KEY not set" for _ in focuses]
+
+    keys = [cache_key("summary_agent", llm.model_name, report_content, focus, SUMMARY_SYSTEM_PROMPT) for focus in focuses]
+    summaries = [get_cached_response(key) for key in keys]
+    pending = [index for index, summary in enumerate(summaries) if summary is None]
+
+    if pending:
+        results = complete_many(
+            llm,
+            [prompt_messages(SUMMARY_SYSTEM_PROMPT, SUMMARY_PROMPT.format(report_content=report_content, focus=focuses[index]))
+             for index in pending],
+            max_concurrency=max_concurrency,
+            use_batch_api=use_batch_api
+        )
+        for index, result in zip(pending, results):
+            if isinstance(result, Exception):
+                logger.error(f"Summary generation failed: {result}")
+                summaries[index] = f"Error generating summary: {result}"
+            else:
+                summaries[index] = result
+                store_response(keys[index], result)
+
+    return summaries
 
 # Tool definition for dynamic discovery
 TOOL_DEFINITION = {
@@ -3,24 +3,91 @@
 Tool Executor - Shared utility for reasoning agents to execute recommended tools
 """
 
+import hashlib
+import heapq
 import logging
+import os
+import re
+import sys
+from collections import defaultdict
+from functools import lru_cache
 from pathlib import Path
+from typing import Dict, Set, Tuple
 
 logger = logging.getLogger(__name__)
 
-def discover_available_tools() -> dict:
-    """Dynamically discover all available tools from the tools directory"""
-    tools = {}
+# Model references in reports: the "**Network:**" header line, then any .bnd mention
+_NETWORK_LINE_PATTERN = re.compile(r"^.*?\*\*Network:\*\*(.*?)(?:\*\*Network:\*\*.*)?$", re.MULTILINE)
+_BND_FILE_PATTERN = re.compile(r"(\S+\.bnd)")
+
+# Phrases that mark a response as asking for tools to be run
+_TRIGGER_PATTERN = re.compile(r"should be run|recommend|suggest|execute|run")
+
+def _tools_signature(tools_dir: Path) -> Tuple[Tuple[str, int], ...]:
+    """Names and modification times of the tool modules; changes whenever a tool is added, removed or edited"""
+    return tuple(sorted(
+        (tool_file.name, tool_file.stat().st_mtime_ns)
+        for tool_file in tools_dir.glob("*.py")
+        if not tool_file.name.startswith("__")
+    ))
+
+# Simulator module every tool imports (located like agent/tools/load_bnd_network.py does)
+_STANDALONE_PATH = Path(__file__).resolve().parent.parent.parent / "gene_network_standalone.py"
+
+def tools_fingerprint() -> str:
+    """
+    Hash of the tool modules' and the simulator's names and modification times, for keying stored tool results
+    """
+    try:
+        standalone_mtime = _STANDALONE_PATH.stat().st_mtime_ns
+    except OSError:
+        standalone_mtime = None
+    signature = (_tools_signature(Path("agent/tools")), standalone_mtime)
+    return hashlib.sha256(repr(signature).encode("utf-8")).hexdigest()
+
+# Snapshot returned when the tools directory is missing
+_EMPTY_SNAPSHOT = {'tools': {}, 'functions': {}, 'tools_block': "", 'plan': (), 'stages': ()}
+
+def _tool_snapshot() -> dict:
+    """
+    Everything derived from tool discovery, built once per state of the tool modules
+    The tools directory is globbed once per call to key the snapshot; callers must treat it as read-only
+    """
     tools_dir = Path("agent/tools")
     
     if not tools_dir.exists():
         logger.warning(f"Tools directory not found: {tools_dir}")
-        return tools
+        return _EMPTY_SNAPSHOT
     
-    for tool_file in tools_dir.glob("*.py"):
-        if tool_file.name.startswith("__"):
-            continue
-            
+    return _build_snapshot(str(tools_dir), _tools_signature(tools_dir))
+
+@lru_cache(maxsize=4)
+def _build_snapshot(tools_dir: str, signature: Tuple[Tuple[str, int], ...]) -> dict:
+    """Discover the tools listed in the signature and derive their lookups, prompt block and execution order"""
+    tools = _discover_tools(tools_dir, signature)
+    upstream = _tool_dependencies(tools)
+    plan = _execution_plan(tools, upstream)
+    return {
+        'tools': tools,
+        'functions': {
+            tool_info['display_name']: tool_info['function']
+            for tool_info in tools.values()
+            if tool_info['function'] is not None
+        },
+        'tools_block': "\n".join(
+            f"- {tool_info['display_name']} - {tool_info['definition']['description']}"
+            for tool_info in tools.values()
+        ),
+        'plan': plan,
+        'stages': _execution_stages(plan, upstream)
+    }
+
+def _discover_tools(tools_dir: str, signature: Tuple[Tuple[str, int], ...]) -> dict:
+    """Import every tool module listed in the signature and collect its TOOL_DEFINITION"""
+    tools = {}
+    
+    for tool_name, _ in signature:
+        tool_file = Path(tools_dir) / tool_name
         try:
             # Import the module dynamically
             module_name = f"agent.tools.{tool_file.stem}"
@@ -34,7 +101,9 @@ def discover_available_tools() -> dict:
                     tools[tool_def['name']] = {
                         'definition': tool_def,
                         'module': module_name,
-                        'display_name': tool_def['name'].replace('_', ' ').title()
+                        # Resolved once here so callers don't re-import per run
+                        'function': getattr(module, 'execute_natural_language', None),
+                        'display_name': sys.intern(tool_def['name'].replace('_', ' ').title())
                     }
                     
         except Exception as e:
@@ -42,30 +111,144 @@ def discover_available_tools() -> dict:
     
     return tools
 
+def discover_available_tools() -> dict:
+    """
+    Dynamically discover all available tools from the tools directory
+    Discovery is reused until the tool modules change; callers must treat the result as read-only
+    """
+    return _tool_snapshot()['tools']
+
+def tool_functions_by_display_name() -> dict:
+    """Map each available tool's display name to its execute_natural_language function, built once per discovery"""
+    return _tool_snapshot()['functions']
+
+def available_tools_block() -> str:
+    """The available tools as a "- Display Name - description" list for prompts, built once per discovery"""
+    return _tool_snapshot()['tools_block']
+
+def get_execution_plan() -> Tuple[str, ...]:
+    """
+    Names of the available tools in execution order, cached with the discovery
+    Tools run after the tools providing their input requirements; ties go to higher priority
+    """
+    return _tool_snapshot()['plan']
+
+def get_execution_stages() -> Tuple[Tuple[str, ...], ...]:
+    """
+    The execution plan grouped into stages: every tool in a stage depends only on
+    tools from earlier stages, so tools within a stage can run concurrently
+    """
+    return _tool_snapshot()['stages']
+
+def _tool_dependencies(tools: dict) -> Dict[str, Set[str]]:
+    """Map each tool to the tools providing its input requirements"""
+    providers = defaultdict(set)
+    for tool_name, tool_info in tools.items():
+        for output in tool_info['definition'].get('output_provides', ()):
+            providers[output].add(tool_name)
+
+    # Requirements no tool provides (e.g. model_path) are external inputs
+    upstream = {}
+    for tool_name, tool_info in tools.items():
+        upstream[tool_name] = set()
+        for requirement in tool_info['definition'].get('input_requirements', ()):
+            upstream[tool_name] |= providers.get(requirement, set())
+        upstream[tool_name].discard(tool_name)
+    return upstream
+
+def _execution_plan(tools: dict, upstream: Dict[str, Set[str]]) -> Tuple[str, ...]:
+    """Topologically sort the discovered tools (Kahn's algorithm over provides -> requires edges)"""
+    dependents = defaultdict(set)
+    indegree = {}
+    for tool_name, providers in upstream.items():
+        indegree[tool_name] = len(providers)
+        for provider in providers:
+            dependents[provider].add(tool_name)
+
+    def rank(tool_name: str) -> Tuple[int, str]:
+        return (-tools[tool_name]['definition'].get('priority', 50), tool_name)
+
+    ready = [rank(tool_name) for tool_name, degree in indegree.items() if degree == 0]
+    heapq.heapify(ready)
+    plan = []
+    while ready:
+        _, tool_name = heapq.heappop(ready)
+        plan.append(tool_name)
+        for dependent in dependents[tool_name]:
+            indegree[dependent] -= 1
+            if indegree[dependent] == 0:
+                heapq.heappush(ready, rank(dependent))
+
+    if len(plan) < len(tools):
+        blocked = sorted(set(tools) - set(plan), key=rank)
+        logger.warning(f"Circular tool dependencies among {blocked}; running them by priority")
+        plan.extend(blocked)
+
+    return tuple(plan)
+
+def _execution_stages(plan: Tuple[str, ...], upstream: Dict[str, Set[str]]) -> Tuple[Tuple[str, ...], ...]:
+    """Assign each tool in the plan to the stage after its latest dependency"""
+    stage_of = {}
+    stages = []
+    for tool_name in plan:
+        # Dependencies caught in a cycle are not placed yet; they are ignored here
+        stage = max((stage_of[dep] + 1 for dep in upstream[tool_name] if dep in stage_of), default=0)
+        stage_of[tool_name] = stage
+        if stage == len(stages):
+            stages.append([])
+        stages[stage].append(tool_name)
+    return tuple(tuple(stage) for stage in stages)
+
+@lru_cache(maxsize=4)
+def _recommendation_index(tools: Tuple[Tuple[str, str, str], ...]):
+    """
+    Per-tool match terms plus one pattern that finds all of them in a single scan
+    Returns (entries, keywords, pattern); entries are (display name, names, description words)
+    """
+    entries = []
+    keywords = set()
+    for tool_name, display_name, description in tools:
+        names = (tool_name.lower(), display_name.lower())
+        words = [word for word in description.lower().split() if len(word) > 3]
+        entries.append((display_name, names, words))
+        keywords.update(names)
+        keywords.update(words)
+
+    # Zero-width lookahead reports a match at every position. Alternatives are tried
+    # longest first, so any keyword starting at a position is a prefix of the match there
+    alternation = "|".join(re.escape(keyword) for keyword in sorted(keywords, key=len, reverse=True))
+    return entries, frozenset(keywords), re.compile(f"(?=({alternation}))")
+
 def extract_tool_recommendations(response_text: str, available_tools_dict: dict) -> list:
     """Extract tool recommendations from LLM response using dynamic tool discovery"""
     recommended_tools = []
     
     response_lower = response_text.lower()
     
+    # Tools are only recommended when the response asks for something to be run;
+    # this does not depend on the tool, so check it once
+    if not _TRIGGER_PATTERN.search(response_lower):
+        return recommended_tools
+    
+    entries, keywords, pattern = _recommendation_index(tuple(
+        (tool_name, tool_info['display_name'], tool_info['definition'].get('description', ''))
+        for tool_name, tool_info in available_tools_dict.items()
+    ))
+    
+    # Every tool name and description keyword that occurs anywhere in the response
+    found = set(pattern.findall(response_lower))
+    mentioned = {keyword for keyword in keywords if any(match.startswith(keyword) for match in found)}
+    
     # Check for tool mentions by name and description keywords
-    for tool_name, tool_info in available_tools_dict.items():
-        tool_def = tool_info['definition']
-        display_name = tool_info['display_name']
-        
+    for display_name, names, description_words in entries:
         # Check for direct tool name mentions
-        if tool_name.lower() in response_lower or display_name.lower() in response_lower:
-            if any(trigger in response_lower for trigger in ["should be run", "recommend", "suggest", "execute", "run"]):
-                recommended_tools.append(display_name)
-                continue
-        
-        # Check for description-based keywords
-        description = tool_def.get('description', '').lower()
-        description_words = description.split()
+        if any(name in mentioned for name in names):
+            recommended_tools.append(display_name)
+            continue
         
         # If multiple description words are mentioned, consider it a recommendation
-        matches = sum(1 for word in description_words if len(word) > 3 and word in response_lower)
-        if matches >= 2 and any(trigger in response_lower for trigger in ["should be run", "recommend", "suggest", "execute", "run"]):
+        matches = sum(1 for word in description_words if word in mentioned)
+        if matches >= 2:
             recommended_tools.append(display_name)
     
     return list(set(recommended_tools))  # Remove duplicates
@@ -77,69 +260,60 @@ def execute_recommended_tools(model_path: str, recommended_tools: list) -> str:
     
     logger.info(f"Executing recommended tools: {', '.join(recommended_tools)}")
     
-    # Get available tools dynamically
-    available_tools_dict = discover_available_tools()
-    
-    # Create mapping from display names to modules
-    tool_modules = {}
-    for tool_name, tool_info in available_tools_dict.items():
-        display_name = tool_info['display_name']
-        tool_modules[display_name] = tool_info['module']
+    # Mapping from display names to entry points for the available tools
+    tool_functions = tool_functions_by_display_name()
     
     results = []
-    context = f"Analyzing gene network: {model_path}"
+    context_parts = [f"Analyzing gene network: {model_path}"]
     
     for tool_name in recommended_tools:
-        if tool_name in tool_modules:
+        if tool_name in tool_functions:
             try:
-                module_name = tool_modules[tool_name]
-                module_parts = module_name.split('.')
-                module = __import__(module_name, fromlist=[module_parts[-1]])
-                result = module.execute_natural_language(context, model_path)
+                result = tool_functions[tool_name]("\n\n".join(context_parts), model_path)
                 results.append(f"## {tool_name}\n{result}\n")
-                context += f"\n\nPrevious analysis from {tool_name}:\n{result}"
+                context_parts.append(f"Previous analysis from {tool_name}:\n{result}")
             except Exception as e:
                 logger.error(f"Failed to execute {tool_name}: {e}")
                 results.append(f"## {tool_name}\nFailed to execute: {e}\n")
         else:
-            logger.warning(f"Tool not found: {tool_name}. Available tools: {list(tool_modules.keys())}")
+            logger.warning(f"Tool not found: {tool_name}. Available tools: {list(tool_functions.keys())}")
     
     return "\n".join(results)
 
+def read_report(report_path: str) -> str:
+    """Read a report file; repeated reads are served from memory until the file changes"""
+    return _read_report(report_path, os.path.getmtime(report_path))
+
+@lru_cache(maxsize=32)
+def _read_report(report_path: str, mtime: float) -> str:
+    """Read the report for a given (path, mtime)"""
+    with open(report_path, 'r') as f:
+        return f.read()
+
 def extract_model_path_from_report(report_path: str) -> str:
     """Extract model path from report content"""
     try:
-        with open(report_path, 'r') as f:
-            content = f.read()
-
-        # Look for model path patterns in the report
-        import re
-        import os
+        content = read_report(report_path)
 
         # Pattern 1: Look for "Network:" lines with .bnd files
-        lines = content.split('\n')
-        for line in lines:
-            if '**Network:**' in line:
-                # Extract filename from the line
-                parts = line.split('**Network:**')
-                if len(parts) > 1:
-                    filename = parts[1].strip()
-                    # Try different path combinations
-                    possible_paths = [
-                        f"models/{filename}",
-                        filename,
-                        f"../models/{filename}",
-                        f"models/{filename}.bnd" if not filename.endswith('.bnd') else f"models/{filename}",
-                        f"{filename}.bnd" if not filename.endswith('.bnd') else filename
-                    ]
-
-                    for path in possible_paths:
-                        if os.path.exists(path):
-                            return path
+        for match in _NETWORK_LINE_PATTERN.finditer(content):
+            # Extract filename from the line
+            filename = match.group(1).strip()
+            # Try different path combinations
+            possible_paths = [
+                f"models/{filename}",
+                filename,
+                f"../models/{filename}",
+                f"models/{filename}.bnd" if not filename.endswith('.bnd') else f"models/{filename}",
+                f"{filename}.bnd" if not filename.endswith('.bnd') else filename
+            ]
+
+            for path in possible_paths:
+                if os.path.exists(path):
+                    return path
 
         # Pattern 2: Look for any .bnd file mentions
-        bnd_pattern = r'(\S+\.bnd)'
-        matches = re.findall(bnd_pattern, content)
+        matches = _BND_FILE_PATTERN.findall(content)
         if matches:
             for match in matches:
                 # Try different path combinations
@@ -0,0 +1,27 @@
+"""
+Shared fixtures: tests run from the gene_network_quality_agent directory, like the CLI,
+so tool discovery and the agent.tools imports resolve the same way
+"""
+import sys
+from pathlib import Path
+
+import pytest
+
+AGENT_DIR = Path(__file__).resolve().parent.parent
+if str(AGENT_DIR) not in sys.path:
+    sys.path.insert(0, str(AGENT_DIR))
+
+
+@pytest.fixture(autouse=True)
+def agent_dir(monkeypatch):
+    """Run each test from the agent directory"""
+    monkeypatch.chdir(AGENT_DIR)
+    return AGENT_DIR
+
+
+@pytest.fixture(autouse=True)
+def response_cache(monkeypatch, tmp_path):
+    """Point the response cache at a throwaway database"""
+    from reasoning_agents import response_cache as cache_module
+    monkeypatch.setattr(cache_module, "CACHE_PATH", tmp_path / "cache.sqlite")
+    return cache_module
@@ -0,0 +1,132 @@
+"""Tests for bulk completions: the Batch API client and complete_many"""
+import json
+import sys
+import types
+from types import SimpleNamespace
+
+import pytest
+
+from reasoning_agents import batch_api
+from reasoning_agents.llm_client import complete_many, prompt_messages
+
+
+class FakeOpenAI:
+    """Stands in for openai.OpenAI; finishes the batch on the first status check"""
+
+    def __init__(self, final_status="completed", output_lines=(), error_lines=()):
+        self.uploaded = None
+        contents = {}
+        if output_lines:
+            contents["output-file"] = "\n".join(json.dumps(line) for line in output_lines)
+        if error_lines:
+            contents["error-file"] = "\n".join(json.dumps(line) for line in error_lines)
+        finished = SimpleNamespace(
+            id="batch-1", status=final_status,
+            output_file_id="output-file" if output_lines else None,
+            error_file_id="error-file" if error_lines else None,
+        )
+
+        def create_file(file, purpose):
+            self.uploaded = file[1]
+            return SimpleNamespace(id="input-file")
+
+        self.files = SimpleNamespace(
+            create=create_file,
+            content=lambda file_id: SimpleNamespace(text=contents[file_id]),
+        )
+        self.batches = SimpleNamespace(
+            create=lambda **kwargs: SimpleNamespace(id="batch-1", status="validating"),
+            retrieve=lambda batch_id: finished,
+        )
+
+
+@pytest.fixture
+def fake_openai(monkeypatch):
+    """Install a FakeOpenAI client factory as the openai module"""
+    def install(client):
+        monkeypatch.setitem(sys.modules, "openai", types.SimpleNamespace(OpenAI=lambda: client))
+        return client
+    return install
+
+
+def _reply(index, content):
+    return {"custom_id": str(index), "response": {"status_code": 200, "body": {"choices": [{"message": {"content": content}}]}}}
+
+
+def test_results_are_matched_to_requests_by_custom_id(fake_openai):
+    client = fake_openai(FakeOpenAI(
+        output_lines=[
+            _reply(2, "third"),
+            _reply(0, "first"),
+            {"custom_id": "1", "response": {"status_code": 500, "body": {"error": "server error"}}},
+        ],
+        error_lines=[{"custom_id": "3", "response": None, "error": {"code": "invalid_request"}}],
+    ))
+    messages = [prompt_messages("system", f"question {index}") for index in range(5)]
+
+    results = batch_api.run_batch("gpt-4o-mini", messages, poll_interval=0)
+
+    assert results[0] == "first" and results[2] == "third"
+    assert isinstance(results[1], RuntimeError) and "server error" in str(results[1])
+    assert isinstance(results[3], RuntimeError) and "invalid_request" in str(results[3])
+    # Requests missing from both files never ran
+    assert isinstance(results[4], RuntimeError) and "before this request ran" in str(results[4])
+
+    requests = [json.loads(line) for line in client.uploaded.decode("utf-8").splitlines()]
+    assert [request["custom_id"] for request in requests] == ["0", "1", "2", "3", "4"]
+    assert requests[1]["body"]["messages"] == messages[1]
+    assert requests[1]["body"]["model"] == "gpt-4o-mini"
+
+
+def test_expired_batch_fails_every_request(fake_openai):
+    fake_openai(FakeOpenAI(final_status="expired"))
+
+    results = batch_api.run_batch("gpt-4o-mini", [prompt_messages("s", "a"), prompt_messages("s", "b")], poll_interval=0)
+
+    assert all(isinstance(result, RuntimeError) and "expired" in str(result) for result in results)
+
+
+class FakeLLM:
+    model_name = "fake-model"
+
+    def __init__(self, results):
+        self.results = results
+        self.config = None
+
+    def batch(self, message_lists, config=None, return_exceptions=False):
+        assert return_exceptions
+        self.config = config
+        return self.results
+
+
+def test_complete_many_returns_text_or_the_exception_per_request():
+    error = TimeoutError("request timed out")
+    llm = FakeLLM([SimpleNamespace(content="answer one"), error, SimpleNamespace(content="answer three")])
+
+    results = complete_many(llm, [[], [], []], max_concurrency=2)
+
+    assert results == ["answer one", error, "answer three"]
+    assert llm.config == {"max_concurrency": 2}
+
+
+def test_complete_many_sends_batch_api_requests_as_one_job(monkeypatch):
+    submitted = []
+    monkeypatch.setattr(batch_api, "run_batch",
+                        lambda model, message_lists: submitted.append((model, message_lists)) or ["done"])
+
+    assert complete_many(FakeLLM([]), [["messages"]], use_batch_api=True) == ["done"]
+    assert submitted == [("fake-model", [["messages"]])]
+
+
+def test_failed_questions_report_errors_and_are_not_cached(response_cache):
+    from reasoning_agents import question_agent
+
+    llm = FakeLLM([SimpleNamespace(content="p53 is a tumour suppressor"), RuntimeError("rate limited")])
+    answers = question_agent.execute_many("report", ["What is p53?", "What is MDM2?"], llm=llm)
+
+    assert answers == ["p53 is a tumour suppressor", "Error processing question: rate limited"]
+    # Only the failed question is sent again
+    llm.results = [SimpleNamespace(content="MDM2 degrades p53")]
+    assert question_agent.execute_many("report", ["What is p53?", "What is MDM2?"], llm=llm) == [
+        "p53 is a tumour suppressor", "MDM2 degrades p53"
+    ]
@@ -0,0 +1,24 @@
+"""Tests for the dynamics simulation"""
+from agent.tools.analyze_dynamics import simulate_network_dynamics
+from agent.tools.load_bnd_network import load_network
+
+
+def test_seeded_simulation_is_reproducible():
+    _, model_data = load_network("models/simple_good_network.bnd")
+
+    first = simulate_network_dynamics(model_data, seed=7)
+    second = simulate_network_dynamics(model_data, seed=7)
+
+    assert first["attractors"] == second["attractors"]
+    assert sorted(first["unstable_nodes"]) == sorted(second["unstable_nodes"])
+    assert first["has_oscillations"] == second["has_oscillations"]
+
+
+def test_attractor_states_cover_every_node():
+    _, model_data = load_network("models/simple_good_network.bnd")
+
+    results = simulate_network_dynamics(model_data, seed=0)
+
+    assert results["num_attractors"] == len(results["attractors"])
+    for attractor in results["attractors"]:
+        assert set(attractor) == set(model_data["nodes"])
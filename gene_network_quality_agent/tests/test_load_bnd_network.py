@@ -0,0 +1,11 @@
+"""Tests for loading BND files into model_data"""
+from agent.tools.load_bnd_network import load_network, nodes_by_type
+
+
+def test_logic_nodes_carry_their_rules_and_inputs():
+    _, model_data = load_network("models/simple_good_network.bnd")
+    nodes = model_data["nodes"]
+
+    assert nodes["MDM2"]["logic"] == "p53 & ! DNA_damage"
+    assert nodes["MDM2"]["inputs"] == ["DNA_damage", "p53"]
+    assert all(info["logic"] != "unknown" for info in nodes.values() if info["type"] == "logic")
@@ -0,0 +1,53 @@
+"""Tests for the perturbation testing tool"""
+import logging
+
+from agent.tools import test_perturbations as perturbations
+
+
+def _logic_node(logic, inputs):
+    return {"type": "logic", "logic": logic, "inputs": inputs}
+
+
+def test_sensitive_inputs_reads_the_packed_truth_table():
+    assert perturbations.sensitive_inputs("A & B") == {"A", "B"}
+    assert perturbations.sensitive_inputs("A | !A") == frozenset()
+    # B cancels out: A & (B | !B) depends on A alone
+    assert perturbations.sensitive_inputs("A & (B | !B)") == {"A"}
+    assert perturbations.sensitive_inputs("(A & B) | (C & !C)") == {"A", "B"}
+
+
+def test_sensitive_inputs_falls_back_above_the_input_limit():
+    names = [f"G{i}" for i in range(perturbations._MAX_TRUTH_TABLE_INPUTS + 1)]
+    # G0 | !G0 is always true, but the rule is too large to enumerate
+    logic = "(G0 | !G0) | " + " | ".join(f"({name} & !{name})" for name in names[1:])
+    assert perturbations.sensitive_inputs(logic) == frozenset(names)
+
+
+def test_sensitive_inputs_treats_uncompilable_rules_as_fully_influential(caplog, capsys):
+    with caplog.at_level(logging.WARNING, logger=perturbations.__name__):
+        assert perturbations.sensitive_inputs("A & & B") == {"A", "B"}
+    assert "could not be compiled" in caplog.text
+    # No per-row evaluation errors are printed
+    assert "Error evaluating expression" not in capsys.readouterr().out
+
+
+def test_robust_and_sensitive_split():
+    model_data = {
+        "nodes": {
+            "In": {"type": "input"},
+            "Hub": _logic_node("In", ["In"]),
+            "A": _logic_node("Hub", ["Hub"]),
+            "B": _logic_node("Hub & A", ["A", "Hub"]),
+            "C": _logic_node("Hub | B", ["B", "Hub"]),
+            "D": _logic_node("Hub & !Hub", ["Hub"]),
+        }
+    }
+    results = perturbations.test_network_perturbations(model_data)
+
+    # Hub drives A, B and C (3 of 5 logic nodes); D's rule never changes
+    assert results["knockout_results"]["Hub"] == 0.6
+    assert results["knockout_results"] == results["overexpression_results"]
+    assert results["knockout_count"] == results["overexpression_count"] == 5
+    # knockout + overexpression below 0.2 is robust, above 0.8 sensitive
+    assert results["robust_nodes"] == ["C", "D"]
+    assert results["sensitive_nodes"] == ["Hub"]
@@ -0,0 +1,139 @@
+"""Tests for running pipeline stages and reusing stored agent results"""
+import asyncio
+import os
+import time
+
+import pytest
+
+from gene_agent import GeneAgent
+
+
+def _agent(name, delay, calls):
+    """A fake pipeline agent that records the context it was given"""
+    def run(context, model_path):
+        calls.append((name, context))
+        time.sleep(delay)
+        return f"{name} result for {model_path}"
+    return name, run
+
+
+def _stages(calls):
+    # Later agents in the second stage finish first when run concurrently
+    return [
+        [_agent("Loader", 0, calls)],
+        [_agent("Slow", 0.05, calls), _agent("Medium", 0.02, calls), _agent("Fast", 0, calls)],
+    ]
+
+
+def _run(stages, max_concurrency, cache_keys=None):
+    return asyncio.run(GeneAgent()._run_pipeline_stages("net.bnd", stages, max_concurrency, cache_keys))
+
+
+@pytest.mark.parametrize("max_concurrency", [1, 4])
+def test_concurrent_stages_match_sequential_runs(max_concurrency):
+    calls = []
+    results = _run(_stages(calls), max_concurrency)
+
+    assert results == [
+        "## Loader\nLoader result for net.bnd\n",
+        "## Slow\nSlow result for net.bnd\n",
+        "## Medium\nMedium result for net.bnd\n",
+        "## Fast\nFast result for net.bnd\n",
+    ]
+    contexts = dict(calls)
+    # Every agent in a stage sees the earlier stages only
+    for name in ("Slow", "Medium", "Fast"):
+        assert contexts[name] == (
+            "Analyzing gene network: net.bnd\n\n"
+            "Previous analysis from Loader:\nLoader result for net.bnd"
+        )
+
+
+def test_pipeline_report_is_the_same_with_and_without_concurrency(monkeypatch):
+    from agent.tools import analyze_dynamics
+
+    # Seed the dynamics simulation so both runs see the same attractors
+    monkeypatch.setattr(analyze_dynamics, "_analyze_dynamics_internal",
+                        lambda model_data, bnd_network=None: analyze_dynamics.simulate_network_dynamics(model_data, seed=0))
+    reports = []
+    agent = GeneAgent()
+    monkeypatch.setattr(agent, "_generate_natural_language_report",
+                        lambda model_path, analysis_results: reports.append(analysis_results))
+
+    for max_concurrency in (1, 4):
+        agent.run_default_pipeline("models/simple_good_network.bnd", max_concurrency=max_concurrency, use_cache=False)
+
+    sequential, concurrent = reports
+    assert concurrent == sequential
+    assert [result.partition("\n")[0] for result in sequential] == [
+        "## Load Bnd Network", "## Analyze Topology", "## Analyze Dynamics",
+        "## Test Perturbations", "## Validate Biology",
+    ]
+
+
+def test_stored_results_are_reused():
+    calls = []
+    stages = [[_agent("Loader", 0, calls)]]
+
+    first = _run(stages, 4, {"Loader": "loader-key"})
+    second = _run(stages, 4, {"Loader": "loader-key"})
+
+    assert first == second
+    assert len(calls) == 1
+
+
+def test_failed_results_are_not_stored():
+    calls = []
+
+    def failing(context, model_path):
+        calls.append(context)
+        return "**Loading Failed**: file vanished"
+
+    stages = [[("Loader", failing)]]
+    _run(stages, 4, {"Loader": "loader-key"})
+    _run(stages, 4, {"Loader": "loader-key"})
+
+    assert len(calls) == 2
+
+
+def test_cache_key_follows_network_and_tool_changes(tmp_path, monkeypatch):
+    tools_dir = tmp_path / "agent" / "tools"
+    tools_dir.mkdir(parents=True)
+    tool_file = tools_dir / "some_tool.py"
+    tool_file.write_text("TOOL_DEFINITION = {}\n")
+    network = tmp_path / "net.bnd"
+    network.write_text("node A {}\n")
+    monkeypatch.chdir(tmp_path)
+    agent = GeneAgent()
+
+    def key():
+        return agent._stage_cache_keys(str(network), ["Some Tool"])["Some Tool"]
+
+    original = key()
+    assert key() == original
+
+    # Editing a tool module (a new modification time) gives a new key
+    stat = tool_file.stat()
+    os.utime(tool_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    edited_tool = key()
+    assert edited_tool != original
+
+    # So does a different network file
+    network.write_text("node B {}\n")
+    assert key() not in (original, edited_tool)
+
+
+def test_unreadable_network_is_not_keyed(tmp_path):
+    assert GeneAgent()._stage_cache_keys(str(tmp_path / "missing.bnd"), ["Some Tool"]) == {}
+
+
+def test_nondeterministic_tools_are_never_keyed(monkeypatch):
+    keyed = []
+    agent = GeneAgent()
+    monkeypatch.setattr(agent, "_stage_cache_keys", lambda model_path, agent_names: keyed.extend(agent_names) or {})
+    monkeypatch.setattr(agent, "_generate_natural_language_report", lambda model_path, analysis_results: None)
+
+    agent.run_default_pipeline("models/simple_good_network.bnd")
+
+    assert "Analyze Dynamics" not in keyed
+    assert "Load Bnd Network" in keyed and "Test Perturbations" in keyed
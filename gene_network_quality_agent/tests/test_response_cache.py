@@ -0,0 +1,47 @@
+"""Tests for the SQLite response cache"""
+import sqlite3
+
+
+def test_stored_response_is_returned(response_cache):
+    key = response_cache.cache_key("question_agent", "model", "report", "What is p53?")
+    response_cache.store_response(key, "A tumour suppressor")
+
+    assert response_cache.get_cached_response(key) == "A tumour suppressor"
+    # Case and whitespace differences share the entry
+    assert response_cache.get_cached_response(
+        response_cache.cache_key("question_agent", "model", "report", "  what is  P53? ")
+    ) == "A tumour suppressor"
+
+
+def test_different_reports_do_not_share_entries(response_cache):
+    response_cache.store_response(response_cache.cache_key("question_agent", "model", "report A", "q"), "answer")
+
+    assert response_cache.get_cached_response(response_cache.cache_key("question_agent", "model", "report B", "q")) is None
+
+
+def test_expired_entries_are_skipped_and_pruned(response_cache, monkeypatch):
+    response_cache.store_response("old", "stale answer")
+    monkeypatch.setattr(response_cache, "CACHE_MAX_AGE_DAYS", 0)
+
+    assert response_cache.get_cached_response("old") is None
+    response_cache.store_response("new", "fresh answer")
+    with sqlite3.connect(response_cache.CACHE_PATH) as connection:
+        keys = [row[0] for row in connection.execute("SELECT key FROM responses")]
+    assert keys == ["new"]
+
+
+def test_databases_from_an_older_layout_are_replaced(response_cache):
+    with sqlite3.connect(response_cache.CACHE_PATH) as connection:
+        connection.execute("CREATE TABLE responses (key TEXT PRIMARY KEY, response TEXT NOT NULL)")
+        connection.execute("INSERT INTO responses VALUES ('key', 'answer from an old version')")
+
+    assert response_cache.get_cached_response("key") is None
+    response_cache.store_response("key", "answer")
+    assert response_cache.get_cached_response("key") == "answer"
+
+
+def test_unusable_cache_is_a_miss(response_cache, monkeypatch, tmp_path):
+    monkeypatch.setattr(response_cache, "CACHE_PATH", tmp_path)  # a directory, not a database
+
+    response_cache.store_response("key", "answer")
+    assert response_cache.get_cached_response("key") is None
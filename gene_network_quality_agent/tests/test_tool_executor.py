@@ -0,0 +1,71 @@
+"""Tests for tool discovery and dependency ordering"""
+import logging
+
+from reasoning_agents import tool_executor
+
+
+def _tools(**definitions):
+    """Tool entries shaped like discovery's, from name=(requires, provides, priority)"""
+    return {
+        name: {
+            'definition': {'input_requirements': requires, 'output_provides': provides, 'priority': priority},
+            'display_name': name.title()
+        }
+        for name, (requires, provides, priority) in definitions.items()
+    }
+
+
+def _order(tools):
+    upstream = tool_executor._tool_dependencies(tools)
+    plan = tool_executor._execution_plan(tools, upstream)
+    return plan, tool_executor._execution_stages(plan, upstream)
+
+
+def test_tools_run_after_their_providers_and_by_priority_within_a_stage():
+    plan, stages = _order(_tools(
+        report=(["topology", "dynamics"], ["report"], 90),
+        topology=(["model"], ["topology"], 10),
+        dynamics=(["model"], ["dynamics"], 20),
+        loader=(["path"], ["model"], 100),
+    ))
+
+    assert plan == ("loader", "dynamics", "topology", "report")
+    assert stages == (("loader",), ("dynamics", "topology"), ("report",))
+
+
+def test_requirements_no_tool_provides_are_external_inputs():
+    plan, stages = _order(_tools(
+        a=(["model_path"], ["x"], 10),
+        b=(["question"], ["y"], 20),
+    ))
+
+    assert plan == ("b", "a")
+    assert stages == (("b", "a"),)
+
+
+def test_cycles_are_run_by_priority_after_the_rest(caplog):
+    with caplog.at_level(logging.WARNING, logger=tool_executor.__name__):
+        plan, stages = _order(_tools(
+            loader=([], ["model"], 100),
+            a=(["model", "y"], ["x"], 10),
+            b=(["model", "x"], ["y"], 20),
+        ))
+
+    assert plan == ("loader", "b", "a")
+    assert "Circular tool dependencies" in caplog.text
+    # Every tool is placed exactly once
+    assert sorted(name for stage in stages for name in stage) == ["a", "b", "loader"]
+    assert stages[0] == ("loader",)
+
+
+def test_discovered_pipeline_stages():
+    assert tool_executor.get_execution_stages() == (
+        ("load_bnd_network",),
+        ("analyze_topology", "analyze_dynamics", "test_perturbations", "validate_biology"),
+    )
+    assert tool_executor.get_execution_plan() == tuple(
+        name for stage in tool_executor.get_execution_stages() for name in stage
+    )
+    assert set(tool_executor.tool_functions_by_display_name()) == {
+        tool_info['display_name'] for tool_info in tool_executor.discover_available_tools().values()
+    }
@@ -20,41 +20,73 @@ import json
 class BooleanExpression:
     """Evaluates boolean expressions with gene states."""
     
+    __slots__ = ('expression', 'gene_names', '_aliases', '_python_expr', '_code')
+    
+    # Identifiers that belong to the expression syntax rather than to genes
+    KEYWORDS = {'and', 'or', 'not', 'True', 'False'}
+    
     def __init__(self, expression: str):
         self.expression = expression.strip()
+        self.gene_names: List[str] = []
+        self._aliases: List[str] = []
+        self._python_expr = ""
+        self._code = None
+        
+        if self.expression:
+            self._compile()
     
-    def evaluate(self, gene_states: Dict[str, bool]) -> bool:
-        """Evaluate the boolean expression given current gene states."""
-        if not self.expression:
-            return False
-            
-        # Replace gene names with their boolean values
-        expr = self.expression
+    def _compile(self):
+        """Translate the expression to Python once and compile it."""
+        aliases = {}
         
-        # Sort gene names by length (longest first) to avoid partial replacements
-        gene_names = sorted(gene_states.keys(), key=len, reverse=True)
+        def alias(match):
+            name = match.group(0)
+            if name in self.KEYWORDS or name.isdigit():
+                return name
+            # Gene names become safe local variable names
+            if name not in aliases:
+                aliases[name] = f"_g{len(aliases)}"
+            return aliases[name]
         
-        for gene_name in gene_names:
-            if gene_name in expr:
-                value = "True" if gene_states[gene_name] else "False"
-                # Use word boundaries to avoid partial replacements
-                expr = re.sub(r'\b' + re.escape(gene_name) + r'\b', value, expr)
+        expr = re.sub(r'\b\w+\b', alias, self.expression)
         
         # Replace logical operators
         expr = expr.replace('&', ' and ')
         expr = expr.replace('|', ' or ')
         expr = expr.replace('!', ' not ')
         
+        self.gene_names = list(aliases)
+        self._aliases = list(aliases.values())
+        self._python_expr = expr.strip()
+        try:
+            self._code = compile(self._python_expr, '<logic>', 'eval')
+        except SyntaxError:
+            self._code = None
+    
+    @property
+    def is_compiled(self) -> bool:
+        """Whether the expression compiled; False for an empty or malformed expression."""
+        return self._code is not None
+    
+    def evaluate(self, gene_states: Dict[str, bool]) -> bool:
+        """Evaluate the boolean expression given current gene states."""
+        if not self.expression:
+            return False
+        
         try:
-            return bool(eval(expr))
+            values = {alias: gene_states[name]
+                      for name, alias in zip(self.gene_names, self._aliases)}
+            return bool(eval(self._code, {'__builtins__': {}}, values))
         except:
-            print(f"Error evaluating expression: {self.expression} -> {expr}")
+            print(f"Error evaluating expression: {self.expression} -> {self._python_expr}")
             return False
 
 
 class NetworkNode:
     """Represents a single node in the gene network."""
     
+    __slots__ = ('name', 'logic_rule', 'is_input', 'state', 'inputs', 'update_function')
+    
     def __init__(self, name: str, logic_rule: str = "", is_input: bool = False):
         self.name = name
         self.logic_rule = logic_rule
@@ -142,6 +174,12 @@ class StandaloneGeneNetwork:
         for name, node in sorted(input_nodes):
             print(f"  {name}: {node.state}")
 
+        # One pattern over all node names so each logic rule is scanned once
+        names_by_length = sorted(self.nodes, key=len, reverse=True)
+        node_name_pattern = re.compile(
+            r'\b(' + '|'.join(re.escape(other_name) for other_name in names_by_length) + r')\b'
+        ) if names_by_length else None
+
         print(f"\nLOGIC NODES ({len(logic_nodes)}):")
         print("-" * 40)
         for name, node in sorted(logic_nodes):
@@ -151,10 +189,10 @@ class StandaloneGeneNetwork:
 
             # Find dependencies
             deps = []
-            if node.logic_rule:
-                for other_name in self.nodes:
-                    if other_name != name and other_name in node.logic_rule:
-                        deps.append(other_name)
+            if node.logic_rule and node_name_pattern:
+                referenced = set(node_name_pattern.findall(node.logic_rule))
+                deps = [other_name for other_name in self.nodes
+                        if other_name != name and other_name in referenced]
             print(f"    Dependencies: {deps}")
             print()
 